@@ -2,6 +2,10 @@
 import streamlit as st
 import yaml
 from pathlib import Path
+try:
+    from yaml import CSafeLoader as SafeLoader  # libyaml-backed parser
+except ImportError:
+    from yaml import SafeLoader
 from src.data.fetchers.etf_data import fetch_sector_performance
 from src.ui.pages.sector_rotation import render_sector_rotation_page
 from src.ui.pages.options import render_options_page
@@ -9,12 +13,26 @@ from src.ui.pages.geo_flow import render_geo_flow_page
 
 st.set_page_config(layout="wide")  # Make the app full-width for wider table
 
+@st.cache_data  # Parse once per file version; each session gets its own copy
+def load_config(path: Path, mtime: float) -> dict:
+    """
+    Load the app configuration from a YAML file.
+    
+    Args:
+        path: Path to config.yaml.
+        mtime: Modification time of the file, so edits to it are reloaded.
+    
+    Returns:
+        Parsed configuration dict.
+    """
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=SafeLoader)
+
 # Resolve path to config.yaml in config/ subfolder
 config_path = Path(__file__).parent / 'config' / 'config.yaml'
 
 try:
-    with open(config_path, 'r') as f:
-        config = yaml.safe_load(f)
+    config = load_config(config_path, config_path.stat().st_mtime)
 except FileNotFoundError:
     st.error(f"Error: config.yaml not found at {config_path}. Please ensure the file exists in the config/ folder.")
     st.stop()
@@ -0,0 +1,87 @@
+# src/data/cache.py
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import tempfile
+import time
+from pathlib import Path
+import pandas as pd
+
+CACHE_DIR = Path(__file__).resolve().parents[2] / '.cache'
+
+def _fingerprint(value) -> str:
+    """Stable text for a cache key; DataFrames and Series are identified by a hash of their contents."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        digest = hashlib.blake2b(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes()).hexdigest()
+        columns = list(value.columns) if isinstance(value, pd.DataFrame) else value.name
+        return f'{type(value).__name__}({columns!r}, {digest})'
+    return repr(value)
+
+def _code_version(func) -> str:
+    """Hash of the source of func's module, so entries written by older code are never served."""
+    try:
+        source = inspect.getsource(inspect.getmodule(func))
+    except (OSError, TypeError):
+        source = func.__code__.co_code.hex()
+    return hashlib.md5(source.encode()).hexdigest()
+
+def _evict(directory: Path, max_entries: int) -> None:
+    """Delete the least recently used entries in directory beyond max_entries."""
+    entries = sorted(directory.glob('*.pkl'), key=lambda p: p.stat().st_atime, reverse=True)
+    for path in entries[max_entries:]:
+        path.unlink(missing_ok=True)
+
+def disk_cache(ttl: int, max_entries: int | None = None):
+    """
+    Persist a function's results as pickles under .cache/ so they survive app restarts.
+
+    Entries are keyed on the function name, its arguments and a hash of its
+    module's source, so editing the module invalidates them. They are recomputed
+    once older than ttl seconds, or when they fail to load (e.g. pickled under
+    another pandas version). None results are not stored, so failed fetches are
+    retried on the next call.
+
+    Args:
+        ttl: Time to live in seconds.
+        max_entries: Keep at most this many entries, evicting the least recently used.
+
+    Returns:
+        Decorator for the function to cache.
+    """
+    def decorator(func):
+        version = _code_version(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key_parts = [version] + [_fingerprint(a) for a in args] + [f'{k}={_fingerprint(v)}' for k, v in sorted(kwargs.items())]
+            key = hashlib.md5(repr(key_parts).encode()).hexdigest()
+            path = CACHE_DIR / func.__name__ / f'{key}.pkl'
+            try:
+                mtime = path.stat().st_mtime
+            except OSError:
+                mtime = None  # Missing entry; recompute below
+            if mtime is not None and time.time() - mtime < ttl:
+                try:
+                    with open(path, 'rb') as f:
+                        result = pickle.load(f)
+                    if max_entries is not None:
+                        os.utime(path, (time.time(), mtime))  # Mark as recently used; keep mtime for the TTL
+                    return result
+                except Exception:
+                    # Truncated, or pickled under incompatible library versions; drop it and recompute
+                    path.unlink(missing_ok=True)
+
+            result = func(*args, **kwargs)
+            if result is not None:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                # Write to a temp file first so concurrent readers never see a partial pickle
+                with tempfile.NamedTemporaryFile(dir=path.parent, suffix='.tmp', delete=False) as f:
+                    pickle.dump(result, f)
+                Path(f.name).replace(path)
+                if max_entries is not None:
+                    _evict(path.parent, max_entries)
+            return result
+        return wrapper
+    return decorator
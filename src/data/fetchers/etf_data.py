@@ -5,6 +5,128 @@ import streamlit as st
 import numpy as np
 from datetime import datetime, timedelta
 
+def _period_days(period: str) -> int:
+    """Approximate calendar length of a yfinance period string (e.g. '5d', '3mo', '1y')."""
+    return int(period.rstrip('dmoy')) * {'d': 1, 'mo': 30, 'y': 365}[period.lstrip('0123456789')]
+
+def _window_starts(dates: np.ndarray, windows: list[str]) -> np.ndarray:
+    """
+    Find where the rows yfinance returns for each period begin in a daily history.
+    
+    Day windows ('1d', '5d') count trading days; month and year windows
+    ('1mo', '1y') are calendar windows ending at the last date, located with
+    a single searchsorted over all cutoffs.
+    
+    Args:
+        dates: Sorted datetime64 array of trading dates.
+        windows: Period strings (e.g., ['5d', '3mo', '1y']).
+    
+    Returns:
+        Array with the index of the first row inside each window.
+    """
+    n = len(dates)
+    starts = np.zeros(len(windows), dtype=np.intp)
+    if n == 0:
+        return starts
+    is_day = np.array([w.endswith('d') for w in windows], dtype=bool)
+    starts[is_day] = np.maximum(n - np.array([int(w[:-1]) for w in windows if w.endswith('d')], dtype=np.intp), 0)
+    if not is_day.all():
+        last = pd.Timestamp(dates[-1])
+        cutoffs = [
+            last - pd.DateOffset(months=int(w[:-2]) if w.endswith('mo') else int(w[:-1]) * 12)
+            for w in windows if not w.endswith('d')
+        ]
+        starts[~is_day] = np.searchsorted(dates, np.array(cutoffs, dtype=dates.dtype), side='left')
+    return starts
+
+def _window_stats(close: np.ndarray, cum_volume: np.ndarray, start: int) -> tuple[float, float, float] | None:
+    """Price change (%), total volume and average volume from start, or None with fewer than two rows."""
+    n = len(close)
+    if n - start <= 1:
+        return None
+    vol_sum = cum_volume[n] - cum_volume[start]
+    return (close[-1] - close[start]) / close[start] * 100, vol_sum, vol_sum / (n - start)
+
+def _last_session_stats(close: np.ndarray, cum_volume: np.ndarray, start: int) -> tuple[float, float, float] | None:
+    """Last session's change (%) and volume with volume averaged from start, or None with fewer than two rows."""
+    n = len(close)
+    if n - start < 2:
+        return None
+    return (close[-1] - close[-2]) / close[-2] * 100, cum_volume[n] - cum_volume[n - 1], (cum_volume[n] - cum_volume[start]) / (n - start)
+
+def _period_spec(periods: list[str], is_weekend: bool) -> dict:
+    """
+    Decide once how each period is computed, so the per-ticker loop only dispatches.
+    
+    On weekends '1d' reports the last session against the one before it, averaged over the past week.
+    
+    Args:
+        periods: List of time periods (e.g., ['1d', '5d', '1mo']).
+        is_weekend: Whether today is a Saturday or Sunday.
+    
+    Returns:
+        Dict of period to (window, stats function, warning shown when the window is too short).
+    """
+    return {
+        p: ('5d', _last_session_stats, 'No recent trading data for {ticker} in period {period}')
+        if p == '1d' and is_weekend else
+        (p, _window_stats, 'Insufficient data for {ticker} in period {period}')
+        for p in periods
+    }
+
+def _fill_performance_row(columns: dict[str, np.ndarray], i: int, ticker: str, full_hist: pd.DataFrame, period_spec: dict) -> None:
+    """
+    Compute performance and volume data for a single sector ETF into row i of the column arrays.
+    
+    Args:
+        columns: Dict of preallocated float64 arrays keyed by column name.
+        i: Row index of the ticker.
+        ticker: ETF ticker symbol.
+        full_hist: Daily history covering the longest period.
+        period_spec: Per-period handling from _period_spec.
+    """
+    close = full_hist['Close'].to_numpy(dtype=np.float64)
+    volume = full_hist['Volume'].to_numpy(dtype=np.float64)
+    # Window sums become two lookups: cum_volume[j] is the total of volume[:j]
+    cum_volume = np.concatenate(([0.0], np.cumsum(volume)))
+    starts = _window_starts(full_hist.index.values, [window for window, _, _ in period_spec.values()])
+    
+    for (period, (_, stats_fn, missing_msg)), start in zip(period_spec.items(), starts):
+        stats = stats_fn(close, cum_volume, start)
+        if stats is None:
+            stats = (0.0, 0.0, 0.0)
+            st.warning(missing_msg.format(ticker=ticker, period=period))
+        columns[f'{period} Change (%)'][i], columns[f'{period} Volume'][i], columns[f'{period} Avg Volume'][i] = stats
+    if len(close) > 0:
+        columns['Price'][i] = close[-1]
+        columns['Volume'][i] = volume[-1]
+    else:
+        st.warning(f"No valid data for {ticker}; excluding from results")
+
+def _download(tickers: list[str], **kwargs) -> pd.DataFrame:
+    """
+    Download daily history for several tickers in one batched yfinance request.
+    
+    Args:
+        tickers: List of ticker symbols.
+        **kwargs: Date range arguments for yf.download (period or start/end).
+    
+    Returns:
+        DataFrame with (ticker, field) columns and a tz-naive date index.
+    """
+    bulk = yf.download(tickers, group_by='ticker', auto_adjust=True, threads=True, progress=False, timeout=10, **kwargs)
+    if bulk is None:
+        return pd.DataFrame()
+    if isinstance(bulk.index, pd.DatetimeIndex) and bulk.index.tz is not None:
+        bulk.index = bulk.index.tz_localize(None)  # Make tz-naive
+    return bulk
+
+def _ticker_history(bulk: pd.DataFrame, ticker: str) -> pd.DataFrame:
+    """Extract one ticker's rows from a batched download, dropping dates it did not trade."""
+    if bulk.empty or ticker not in bulk.columns.get_level_values(0):
+        return pd.DataFrame(columns=['Close', 'Volume'])
+    return bulk[ticker].dropna(subset=['Close'])
+
 @st.cache_data(ttl=3600)  # Cache for 1 hour
 def fetch_sector_performance(periods: list[str]) -> pd.DataFrame:
     """
@@ -30,55 +152,31 @@ def fetch_sector_performance(periods: list[str]) -> pd.DataFrame:
         'XLB': 'Materials',
         'XBI': 'Biotechnology'
     }
-    data = []
+    tickers = list(sector_etfs)
     today = datetime.now()
     is_weekend = today.weekday() >= 5  # Saturday (5) or Sunday (6)
     
-    for ticker, sector in sector_etfs.items():
+    period_spec = _period_spec(periods, is_weekend)
+    
+    # One batched request for the longest window; shorter windows are sliced from it
+    try:
+        bulk = _download(tickers, period=max((window for window, _, _ in period_spec.values()), key=_period_days))
+    except Exception as e:
+        st.error(f"Error fetching sector ETF data: {e}")
+        bulk = pd.DataFrame()
+    
+    # Preallocate one float64 array per metric; rows are filled in place by index
+    numeric_cols = [f'{p}{metric}' for p in periods for metric in (' Change (%)', ' Volume', ' Avg Volume')] + ['Price', 'Volume']
+    columns = {col: np.full(len(tickers), np.nan) for col in numeric_cols}
+    fetched = np.zeros(len(tickers), dtype=bool)
+    for i, ticker in enumerate(tickers):
         try:
-            yf_ticker = yf.Ticker(ticker)
-            row = {'Ticker': ticker, 'Sector': sector}
-            last_hist = None
-            for period in periods:
-                if period == '1d' and is_weekend:
-                    hist = yf_ticker.history(period='5d')
-                    if not hist.empty and len(hist) >= 2:
-                        price_change = ((hist['Close'].iloc[-1] - hist['Close'].iloc[-2]) / hist['Close'].iloc[-2]) * 100
-                        row[f'{period} Change (%)'] = price_change
-                        row[f'{period} Volume'] = hist['Volume'].iloc[-1]
-                        row[f'{period} Avg Volume'] = hist['Volume'].mean()
-                    else:
-                        row[f'{period} Change (%)'] = 0.0
-                        row[f'{period} Volume'] = 0.0
-                        row[f'{period} Avg Volume'] = 0.0
-                        st.warning(f"No recent trading data for {ticker} in period {period}")
-                else:
-                    hist = yf_ticker.history(period=period)
-                    if not hist.empty and len(hist) > 1:
-                        price_change = ((hist['Close'].iloc[-1] - hist['Close'].iloc[0]) / hist['Close'].iloc[0]) * 100
-                        row[f'{period} Change (%)'] = price_change
-                        row[f'{period} Volume'] = hist['Volume'].sum()
-                        row[f'{period} Avg Volume'] = hist['Volume'].mean()
-                    else:
-                        row[f'{period} Change (%)'] = 0.0
-                        row[f'{period} Volume'] = 0.0
-                        row[f'{period} Avg Volume'] = 0.0
-                        st.warning(f"Insufficient data for {ticker} in period {period}")
-                last_hist = hist if not hist.empty else last_hist
-            if last_hist is not None and not last_hist.empty:
-                row['Price'] = last_hist['Close'].iloc[-1]
-                row['Volume'] = last_hist['Volume'].iloc[-1]
-            else:
-                row['Price'] = None
-                row['Volume'] = None
-                st.warning(f"No valid data for {ticker}; excluding from results")
-            data.append(row)
+            _fill_performance_row(columns, i, ticker, _ticker_history(bulk, ticker), period_spec)
+            fetched[i] = True
         except Exception as e:
             st.error(f"Error fetching data for {ticker}: {e}")
     
-    df = pd.DataFrame(data)
-    numeric_cols = ['Price', 'Volume'] + [f'{p} Change (%)' for p in periods] + [f'{p} Volume' for p in periods] + [f'{p} Avg Volume' for p in periods]
-    df[numeric_cols] = df[numeric_cols].apply(pd.to_numeric, errors='coerce')
+    df = pd.DataFrame({'Ticker': tickers, 'Sector': [sector_etfs[t] for t in tickers], **columns})[fetched]
     dropped_tickers = df[df['Price'].isna()]['Ticker'].tolist()
     if dropped_tickers:
         st.warning(f"Dropped tickers due to missing Price data: {', '.join(dropped_tickers)}")
@@ -97,25 +195,41 @@ def fetch_historical_sector_data(tickers: list[str], start_date: str, end_date:
     Returns:
         DataFrame with daily Close and Volume for each ticker.
     """
-    dfs = []
+    try:
+        bulk = _download(tickers, start=start_date, end=end_date)
+    except Exception as e:
+        st.error(f"Error fetching historical data: {e}")
+        bulk = pd.DataFrame()
+    
+    # Check the batched Close columns directly rather than slicing a copy per ticker
+    downloaded = set(bulk.columns.get_level_values(0)) if not bulk.empty else set()
     for ticker in tickers:
-        try:
-            yf_ticker = yf.Ticker(ticker)
-            hist = yf_ticker.history(start=start_date, end=end_date, auto_adjust=True)
-            if hist.empty:
-                st.warning(f"No historical data for ticker {ticker} from {start_date} to {end_date}")
-                continue
-            ticker_data = hist[['Close', 'Volume']].reset_index()
-            ticker_data['Ticker'] = ticker
-            ticker_data = ticker_data[['Date', 'Ticker', 'Close', 'Volume']]
-            ticker_data['Date'] = pd.to_datetime(ticker_data['Date']).dt.tz_localize(None)  # Make tz-naive
-            dfs.append(ticker_data)
-        except Exception as e:
-            st.error(f"Error fetching historical data for {ticker}: {e}")
+        if ticker not in downloaded or not bulk[(ticker, 'Close')].notna().any():
+            st.warning(f"No historical data for ticker {ticker} from {start_date} to {end_date}")
     
-    if dfs:
-        df = pd.concat(dfs, ignore_index=True)
-        df = df.dropna()
-        return df
+    if not bulk.empty:
+        df = bulk.stack(level=0, future_stack=True).rename_axis(['Date', 'Ticker']).reset_index()
+        df = df[['Date', 'Ticker', 'Close', 'Volume']].dropna()
+        if not df.empty:
+            return df.reset_index(drop=True)
     st.error("No historical data retrieved for any tickers.")
-    return pd.DataFrame()
\ No newline at end of file
+    return pd.DataFrame()
+
+@st.cache_data(ttl=300)  # Cache for 5 minutes
+def fetch_price_histories(tickers: list[str], period: str) -> dict[str, pd.DataFrame]:
+    """
+    Fetch daily price history for several tickers in one batched request.
+    
+    Args:
+        tickers: List of ticker symbols.
+        period: yfinance period string (e.g., '1y').
+    
+    Returns:
+        Dict of ticker to DataFrame with Open, High, Low, Close and Volume columns; empty for tickers without data.
+    """
+    try:
+        bulk = _download(tickers, period=period)
+    except Exception as e:
+        st.error(f"Error fetching price histories: {e}")
+        bulk = pd.DataFrame()
+    return {ticker: _ticker_history(bulk, ticker) for ticker in tickers}
@@ -3,7 +3,123 @@ import pandas as pd
 import yfinance as yf
 import numpy as np
 from datetime import datetime, timedelta
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor
 import streamlit as st
+from src.data.cache import disk_cache
+
+@st.cache_resource(ttl=3600)  # One Ticker per symbol for single-threaded callers; refreshed hourly
+def _get_ticker(ticker: str) -> yf.Ticker:
+    """
+    Get a shared yfinance Ticker object for a symbol.
+    
+    The Ticker is stateful (its lazy loads mutate its session and statement
+    caches) and shared by every session, so only use it from the script
+    thread. Code running on worker threads must build its own yf.Ticker.
+    
+    Args:
+        ticker: Stock ticker.
+    
+    Returns:
+        yfinance Ticker, reused so its downloaded statements are too.
+    """
+    return yf.Ticker(ticker)
+
+@st.cache_data(ttl=3600)  # Cache for 1 hour
+@disk_cache(ttl=3600)  # Persist for 1 hour across restarts
+def _get_info(ticker: str) -> dict:
+    """
+    Fetch the yfinance info dict for a ticker.
+    
+    Args:
+        ticker: Stock ticker.
+    
+    Returns:
+        Dict of quote and valuation fields.
+    """
+    # A private Ticker, since this runs on pool workers; only the plain dict is shared
+    return dict(yf.Ticker(ticker).info)
+
+def _quarterly_earnings_growth(yf_ticker: yf.Ticker) -> float:
+    """
+    Derive year-over-year earnings growth from the last eight quarterly Net Income values.
+    
+    Args:
+        yf_ticker: yfinance Ticker of the stock.
+    
+    Returns:
+        Growth as a fraction, or NaN if there are too few quarters.
+    """
+    q_income = yf_ticker.quarterly_income_stmt
+    if q_income is not None and 'Net Income' in q_income.index and len(q_income.columns) >= 8:
+        net_income = q_income.loc['Net Income']
+        recent_earnings = net_income.iloc[-4:].sum()
+        prior_earnings = net_income.iloc[-8:-4].sum()
+        if prior_earnings != 0:
+            return (recent_earnings - prior_earnings) / abs(prior_earnings)
+    return np.nan
+
+# Valuation metrics averaged by the sector and market financials
+FINANCIAL_METRICS = ['trailing_pe', 'forward_pe', 'peg_ratio', 'price_sales', 'price_book']
+
+def _row_from_ticker(ticker: str, yf_ticker: yf.Ticker | None = None) -> dict:
+    """
+    Read all valuation metrics for a stock in one pass over its info dict.
+    
+    The PEG ratio falls back to trailing P/E over earnings growth, and the quarterly
+    income statement is only fetched when info has neither PEG nor growth.
+    
+    Args:
+        ticker: Stock ticker.
+        yf_ticker: Ticker for the quarterly fallback; pass a private one from worker
+            threads. Defaults to the shared _get_ticker object.
+    
+    Returns:
+        Dict keyed by FINANCIAL_METRICS.
+    """
+    info = _get_info(ticker)
+    trailing_pe = info.get('trailingPE', np.nan)
+    peg = info.get('pegRatio', np.nan)
+    if pd.isna(peg):
+        growth = info.get('earningsGrowth', np.nan)
+        if pd.isna(growth):
+            growth = _quarterly_earnings_growth(yf_ticker if yf_ticker is not None else _get_ticker(ticker))
+        if not pd.isna(trailing_pe) and not pd.isna(growth) and growth != 0:
+            peg = trailing_pe / (growth * 100)
+    return {
+        'trailing_pe': trailing_pe,
+        'forward_pe': info.get('forwardPE', np.nan),
+        'peg_ratio': peg,
+        'price_sales': info.get('priceToSalesTrailing12Months', np.nan),
+        'price_book': info.get('priceToBook', np.nan),
+    }
+
+def _average_financials(tickers: list[str]) -> pd.DataFrame:
+    """
+    Fetch valuation metrics for a list of stocks and average them, ignoring missing values.
+    
+    Args:
+        tickers: List of stock tickers.
+    
+    Returns:
+        Single-row DataFrame with FINANCIAL_METRICS columns, or empty if nothing was fetched.
+    """
+    values = np.full((len(tickers), len(FINANCIAL_METRICS)), np.nan)
+    fetched = 0
+    for i, ticker in enumerate(tickers):
+        try:
+            row = _row_from_ticker(ticker)
+            values[i] = [row[metric] for metric in FINANCIAL_METRICS]
+            fetched += 1
+        except Exception as e:
+            st.warning(f"Failed to fetch data for {ticker}: {str(e)}")
+    
+    if not fetched:
+        return pd.DataFrame()
+    # NaN-skipping mean; metrics missing for every stock stay NaN
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = np.nansum(values, axis=0) / np.sum(~np.isnan(values), axis=0)
+    return pd.DataFrame([means], columns=FINANCIAL_METRICS)
 
 @st.cache_data(ttl=3600)  # Cache for 1 hour
 def fetch_sector_financials(sector: str, sector_stocks: dict) -> pd.DataFrame:
@@ -20,40 +136,7 @@ def fetch_sector_financials(sector: str, sector_stocks: dict) -> pd.DataFrame:
     stocks = sector_stocks.get(sector, [])
     if not stocks:
         return pd.DataFrame()
-    
-    data = []
-    for ticker in stocks:
-        try:
-            yf_ticker = yf.Ticker(ticker)
-            info = yf_ticker.info
-            peg = info.get('pegRatio', np.nan)
-            if pd.isna(peg):
-                trailing_pe = info.get('trailingPE', np.nan)
-                growth = info.get('earningsGrowth', np.nan)
-                if pd.isna(growth):  # Fallback: calculate growth from quarterly income statement
-                    q_income = yf_ticker.quarterly_income_stmt
-                    if q_income is not None and 'Net Income' in q_income.index and len(q_income.columns) >= 8:
-                        recent_earnings = q_income.loc['Net Income'].iloc[-4:].sum()
-                        prior_earnings = q_income.loc['Net Income'].iloc[-8:-4].sum()
-                        if prior_earnings != 0:
-                            growth = (recent_earnings - prior_earnings) / abs(prior_earnings)
-                if not pd.isna(trailing_pe) and not pd.isna(growth) and growth != 0:
-                    peg = trailing_pe / (growth * 100)
-            data.append({
-                'trailing_pe': info.get('trailingPE', np.nan),
-                'forward_pe': info.get('forwardPE', np.nan),
-                'peg_ratio': peg,
-                'price_sales': info.get('priceToSalesTrailing12Months', np.nan),
-                'price_book': info.get('priceToBook', np.nan),
-            })
-        except Exception as e:
-            st.warning(f"Failed to fetch data for {ticker}: {str(e)}")
-            continue
-    
-    if data:
-        df = pd.DataFrame(data)
-        return df.mean(numeric_only=True, skipna=True).to_frame().T
-    return pd.DataFrame()
+    return _average_financials(stocks)
 
 @st.cache_data(ttl=3600)  # Cache for 1 hour
 def fetch_market_financials(sector_stocks: dict) -> pd.DataFrame:
@@ -66,103 +149,104 @@ def fetch_market_financials(sector_stocks: dict) -> pd.DataFrame:
     Returns:
         DataFrame with averaged metrics.
     """
-    all_data = []
-    for t in [ticker for stocks in sector_stocks.values() for ticker in stocks]:
-        try:
-            yf_ticker = yf.Ticker(t)
-            info = yf_ticker.info
-            peg = info.get('pegRatio', np.nan)
-            if pd.isna(peg):
-                trailing_pe = info.get('trailingPE', np.nan)
-                growth = info.get('earningsGrowth', np.nan)
-                if pd.isna(growth):  # Fallback: calculate growth from quarterly income statement
-                    q_income = yf_ticker.quarterly_income_stmt
-                    if q_income is not None and 'Net Income' in q_income.index and len(q_income.columns) >= 8:
-                        recent_earnings = q_income.loc['Net Income'].iloc[-4:].sum()
-                        prior_earnings = q_income.loc['Net Income'].iloc[-8:-4].sum()
-                        if prior_earnings != 0:
-                            growth = (recent_earnings - prior_earnings) / abs(prior_earnings)
-                if not pd.isna(trailing_pe) and not pd.isna(growth) and growth != 0:
-                    peg = trailing_pe / (growth * 100)
-            all_data.append({
-                'trailing_pe': info.get('trailingPE', np.nan),
-                'forward_pe': info.get('forwardPE', np.nan),
-                'peg_ratio': peg,
-                'price_sales': info.get('priceToSalesTrailing12Months', np.nan),
-                'price_book': info.get('priceToBook', np.nan),
-            })
-        except Exception as e:
-            st.warning(f"Failed to fetch data for {t}: {str(e)}")
-            continue
+    # Stocks listed under several sectors are fetched and counted once
+    return _average_financials(list(dict.fromkeys(chain.from_iterable(sector_stocks.values()))))
+
+@st.cache_data(ttl=3600)  # Cache for 1 hour
+def _price_history(_yf_ticker: yf.Ticker, ticker: str) -> pd.Series:
+    """
+    Fetch five years of daily closing prices for a ticker.
     
-    if all_data:
-        df = pd.DataFrame(all_data)
-        return df.mean(numeric_only=True, skipna=True).to_frame().T
-    return pd.DataFrame()
+    Args:
+        _yf_ticker: yfinance Ticker owned by the caller (not hashed by the cache).
+        ticker: Stock ticker, used as the cache key.
+    
+    Returns:
+        Close series indexed by tz-naive date.
+    """
+    hist = _yf_ticker.history(period='5y')
+    if hist.empty:
+        return pd.Series(dtype=float)
+    close = hist['Close']
+    close.index = close.index.tz_localize(None)
+    return close
 
 @st.cache_data(ttl=3600)  # Cache for 1 hour
-def get_trailing_multiples(ticker: str, target_date: datetime) -> dict:
+@disk_cache(ttl=3600)  # Persist for 1 hour across restarts
+def _fetch_ticker_bundle(ticker: str) -> tuple[pd.Series, pd.DataFrame, pd.DataFrame]:
     """
-    Calculate trailing multiples for a stock at a specific date using historical financials.
+    Fetch the closing prices and quarterly statements used for trailing multiples.
     
     Args:
         ticker: Stock ticker.
+    
+    Returns:
+        Tuple of (5-year daily Close series, quarterly income statement,
+        quarterly balance sheet), with statements transposed to one row per quarter.
+        Later parts are left empty, and not fetched, once an earlier one is insufficient.
+    """
+    # Runs in fetch_historical_multiples' worker pool, so use a Ticker no other thread touches
+    yf_ticker = yf.Ticker(ticker)
+    # Fetch the parts most often missing first and skip the rest when they are
+    q_income = yf_ticker.quarterly_income_stmt
+    if q_income is None or 'Net Income' not in q_income.index or len(q_income.columns) < 4:
+        return pd.Series(dtype=float), pd.DataFrame(), pd.DataFrame()
+    q_balance = yf_ticker.quarterly_balance_sheet
+    if q_balance is None or q_balance.empty:
+        return pd.Series(dtype=float), q_income.T, pd.DataFrame()
+    return _price_history(yf_ticker, ticker), q_income.T, q_balance.T
+
+def _multiples_at(bundle: tuple[pd.Series, pd.DataFrame, pd.DataFrame], target_date: datetime) -> dict:
+    """
+    Calculate trailing multiples at a date from an already fetched ticker bundle.
+    
+    Args:
+        bundle: Tuple from _fetch_ticker_bundle.
         target_date: Date for calculation.
     
     Returns:
         Dict with 'Trailing P/E', 'Price/Sales (ttm)', 'Price/Book' or None if data missing.
     """
-    try:
-        yf_ticker = yf.Ticker(ticker)
-        
-        # Get price around target_date (handle weekends)
-        start = target_date - timedelta(days=5)
-        end = target_date + timedelta(days=1)
-        hist = yf_ticker.history(start=start.date(), end=end.date())
-        if hist.empty:
-            return None
-        price = hist['Close'].iloc[-1]
-        
-        # Quarterly income statement before date
-        q_income = yf_ticker.quarterly_income_stmt
-        if q_income is None or 'Net Income' not in q_income.index or len(q_income.columns) < 4:
-            return None
-        q_income = q_income.T
-        q_income['Date'] = pd.to_datetime(q_income.index)
-        past_income = q_income[q_income['Date'] < target_date].sort_values('Date').tail(4)
-        if len(past_income) < 4:
-            return None
-        ttm_earnings = past_income['Net Income'].sum()
-        ttm_revenue = past_income.get('Total Revenue', pd.Series([np.nan] * len(past_income))).sum()
-        
-        # Quarterly balance sheet (latest before date)
-        q_balance = yf_ticker.quarterly_balance_sheet.T
-        if q_balance.empty:
-            return None
-        q_balance['Date'] = pd.to_datetime(q_balance.index)
-        past_balance = q_balance[q_balance['Date'] < target_date].sort_values('Date').iloc[-1]
-        
-        shares_key = 'Ordinary Shares Number' if 'Ordinary Shares Number' in past_balance else 'Common Stock Shares Outstanding'
-        shares = past_balance.get(shares_key, np.nan)
-        if pd.isna(shares):
-            return None
-        
-        book_value = past_balance.get('Total Stockholder Equity', np.nan)
-        
-        market_cap = price * shares
-        
-        trailing_pe = market_cap / ttm_earnings if ttm_earnings != 0 else np.nan
-        price_sales = market_cap / ttm_revenue if ttm_revenue != 0 else np.nan
-        price_book = market_cap / book_value if book_value != 0 and not pd.isna(book_value) else np.nan
-        
-        return {
-            'Trailing P/E': trailing_pe,
-            'Price/Sales (ttm)': price_sales,
-            'Price/Book': price_book
-        }
-    except Exception as e:
-        st.warning(f"Failed to fetch historical data for {ticker}: {str(e)}")
+    close, q_income, q_balance = bundle
+    
+    # Quarterly income statement before date
+    if 'Net Income' not in q_income.columns or len(q_income) < 4:
         return None
+    past_income = q_income[pd.to_datetime(q_income.index) < target_date].sort_index().tail(4)
+    if len(past_income) < 4:
+        return None
+    
+    # Quarterly balance sheet (latest before date)
+    if q_balance.empty:
+        return None
+    past_balance = q_balance[pd.to_datetime(q_balance.index) < target_date].sort_index().iloc[-1]
+    
+    # Last close on or before target_date (handles weekends and holidays)
+    price = close.asof(pd.Timestamp(target_date)) if not close.empty else np.nan
+    if pd.isna(price):
+        return None
+    
+    ttm_earnings = past_income['Net Income'].sum()
+    ttm_revenue = past_income.get('Total Revenue', pd.Series([np.nan] * len(past_income))).sum()
+    
+    shares_key = 'Ordinary Shares Number' if 'Ordinary Shares Number' in past_balance else 'Common Stock Shares Outstanding'
+    shares = past_balance.get(shares_key, np.nan)
+    if pd.isna(shares):
+        return None
+    
+    book_value = past_balance.get('Total Stockholder Equity', np.nan)
+    
+    market_cap = price * shares
+    
+    trailing_pe = market_cap / ttm_earnings if ttm_earnings != 0 else np.nan
+    price_sales = market_cap / ttm_revenue if ttm_revenue != 0 else np.nan
+    price_book = market_cap / book_value if book_value != 0 and not pd.isna(book_value) else np.nan
+    
+    return {
+        'Trailing P/E': trailing_pe,
+        'Price/Sales (ttm)': price_sales,
+        'Price/Book': price_book
+    }
 
 @st.cache_data(ttl=3600)  # Cache for 1 hour
 def fetch_historical_multiples(stocks: list[str], years_ago: list[int] = [0, 1, 3]) -> pd.DataFrame:
@@ -177,22 +261,34 @@ def fetch_historical_multiples(stocks: list[str], years_ago: list[int] = [0, 1,
         DataFrame with rows as times, columns as metrics.
     """
     data = {y: [] for y in years_ago}
-    for y in years_ago:
-        date = datetime.now() - timedelta(days=y * 365)
-        for ticker in stocks:
-            multiples = get_trailing_multiples(ticker, date)
+    dates = {y: datetime.now() - timedelta(days=y * 365) for y in years_ago}
+    # Fetch tickers concurrently; each bundle is then evaluated for every date locally
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        futures = {ticker: executor.submit(_fetch_ticker_bundle, ticker) for ticker in dict.fromkeys(stocks)}
+    for ticker in stocks:
+        try:
+            bundle = futures[ticker].result()
+        except Exception as e:
+            st.warning(f"Failed to fetch historical data for {ticker}: {str(e)}")
+            continue
+        for y in years_ago:
+            try:
+                multiples = _multiples_at(bundle, dates[y])
+            except Exception as e:
+                st.warning(f"Failed to fetch historical data for {ticker}: {str(e)}")
+                continue
             if multiples:
                 data[y].append(multiples)
     
-    avg_df = pd.DataFrame()
+    rows = []
     for y in years_ago:
         if data[y]:
             df = pd.DataFrame(data[y])
             avg = df.mean(skipna=True)
             avg.name = f'{y}Y Ago' if y > 0 else 'Current'
-            avg_df = pd.concat([avg_df, avg.to_frame().T])
+            rows.append(avg.to_frame().T)
     
-    return avg_df
+    return pd.concat(rows) if rows else pd.DataFrame()
 
 @st.cache_data(ttl=3600)  # Cache for 1 hour
 def fetch_market_historical_financials(sector_stocks: dict) -> pd.DataFrame:
@@ -205,31 +301,21 @@ def fetch_market_historical_financials(sector_stocks: dict) -> pd.DataFrame:
     Returns:
         DataFrame with times as rows, metrics as columns.
     """
-    all_stocks = [t for stocks in sector_stocks.values() for t in stocks]
+    # Stocks listed under several sectors are fetched and counted once
+    all_stocks = list(dict.fromkeys(chain.from_iterable(sector_stocks.values())))
     hist_df = fetch_historical_multiples(all_stocks)
     
     # Add current forward/PEG from .info averages
     current_data = []
+    # Each job gets its own Ticker; the shared _get_ticker object is not thread-safe
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = {t: executor.submit(_row_from_ticker, t, yf.Ticker(t)) for t in all_stocks}
     for t in all_stocks:
         try:
-            yf_ticker = yf.Ticker(t)
-            info = yf_ticker.info
-            peg = info.get('pegRatio', np.nan)
-            if pd.isna(peg):
-                trailing_pe = info.get('trailingPE', np.nan)
-                growth = info.get('earningsGrowth', np.nan)
-                if pd.isna(growth):  # Fallback: calculate growth from quarterly income statement
-                    q_income = yf_ticker.quarterly_income_stmt
-                    if q_income is not None and 'Net Income' in q_income.index and len(q_income.columns) >= 8:
-                        recent_earnings = q_income.loc['Net Income'].iloc[-4:].sum()
-                        prior_earnings = q_income.loc['Net Income'].iloc[-8:-4].sum()
-                        if prior_earnings != 0:
-                            growth = (recent_earnings - prior_earnings) / abs(prior_earnings)
-                if not pd.isna(trailing_pe) and not pd.isna(growth) and growth != 0:
-                    peg = trailing_pe / (growth * 100)
+            row = futures[t].result()
             current_data.append({
-                'Forward P/E': info.get('forwardPE', np.nan),
-                'PEG Ratio': peg,
+                'Forward P/E': row['forward_pe'],
+                'PEG Ratio': row['peg_ratio'],
             })
         except Exception as e:
             st.warning(f"Failed to fetch data for {t}: {str(e)}")
@@ -2,7 +2,81 @@
 import yfinance as yf
 import pandas as pd
 import streamlit as st
+import logging
 from datetime import datetime
+from concurrent.futures import Future, ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Background workers that warm the chain cache for expirations not yet viewed
+_prefetch_pool = ThreadPoolExecutor(max_workers=4)
+# Number of expirations after the selected one to warm on first load
+PREFETCH_EXPIRATIONS = 3
+
+@st.cache_data(ttl=3600)  # Cache for 1 hour
+def _expirations(ticker: str) -> tuple[str, ...]:
+    """
+    Fetch the available option expiration dates for a ticker.
+    
+    Cached apart from the chains, so switching to a prefetched expiration
+    needs no network round trip.
+    
+    Args:
+        ticker: Stock or ETF ticker symbol.
+    
+    Returns:
+        Tuple of expiration dates (YYYY-MM-DD), nearest first.
+    """
+    return tuple(yf.Ticker(ticker).options)
+
+@st.cache_data(ttl=3600)  # Cache for 1 hour
+def _option_chain(_yf_ticker: yf.Ticker, ticker: str, expiration_date: str) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Fetch the raw calls and puts for one expiration.
+    
+    Args:
+        _yf_ticker: yfinance Ticker for the symbol (not hashed by the cache).
+        ticker: Stock or ETF ticker symbol, used as the cache key.
+        expiration_date: Expiration date (YYYY-MM-DD).
+    
+    Returns:
+        Tuple of (calls, puts) DataFrames.
+    """
+    option_chain = _yf_ticker.option_chain(expiration_date)
+    return option_chain.calls, option_chain.puts
+
+def _prefetch_chain(ticker: str, expiration_date: str) -> None:
+    """
+    Warm the chain cache for one expiration from a background worker.
+    
+    Each job builds its own yfinance Ticker, since a Ticker's session and
+    chain cache are not safe to share between threads.
+    
+    Args:
+        ticker: Stock or ETF ticker symbol.
+        expiration_date: Expiration date (YYYY-MM-DD).
+    """
+    _option_chain(yf.Ticker(ticker), ticker, expiration_date)
+
+def _log_prefetch_failure(future: Future) -> None:
+    """Log the exception of a failed prefetch job, if any."""
+    error = future.exception()
+    if error is not None:
+        logger.warning("Option chain prefetch failed: %s", error, exc_info=error)
+
+@st.cache_data(ttl=60)  # Cache for 1 minute
+def fetch_current_price(ticker: str) -> float:
+    """
+    Fetch the latest close for a ticker.
+    
+    Args:
+        ticker: Stock or ETF ticker symbol.
+    
+    Returns:
+        Latest closing price, or 0.0 if no data.
+    """
+    price_history = yf.Ticker(ticker).history(period='1d')
+    return float(price_history['Close'].iloc[-1]) if not price_history.empty else 0.0
 
 @st.cache_data(ttl=3600)  # Cache for 1 hour
 def fetch_option_chain(ticker: str, expiration_date: str = None) -> dict:
@@ -17,9 +91,8 @@ def fetch_option_chain(ticker: str, expiration_date: str = None) -> dict:
         Dict with 'calls' and 'puts' DataFrames, or empty dict if no data.
     """
     try:
-        yf_ticker = yf.Ticker(ticker)
         # Get available expiration dates
-        expiration_dates = yf_ticker.options
+        expiration_dates = _expirations(ticker)
         if not expiration_dates:
             st.warning(f"No option chain data available for {ticker}.")
             return {'calls': pd.DataFrame(), 'puts': pd.DataFrame(), 'expiration_dates': []}
@@ -28,25 +101,25 @@ def fetch_option_chain(ticker: str, expiration_date: str = None) -> dict:
         selected_date = expiration_date if expiration_date in expiration_dates else expiration_dates[0]
         
         # Fetch option chain
-        option_chain = yf_ticker.option_chain(selected_date)
-        calls = option_chain.calls
-        puts = option_chain.puts
-        
-        # Remove duplicate strikes
-        calls = calls.drop_duplicates(subset=['strike'])
-        puts = puts.drop_duplicates(subset=['strike'])
+        calls, puts = _option_chain(yf.Ticker(ticker), ticker, selected_date)
+        if expiration_date is None:
+            # First load for this ticker: fetch the next few expirations in the background
+            # so switching to them later reads from the cache
+            for date in expiration_dates[1:1 + PREFETCH_EXPIRATIONS]:
+                future = _prefetch_pool.submit(_prefetch_chain, ticker, date)
+                future.add_done_callback(_log_prefetch_failure)
         
-        # Debug: Check for duplicates
-        if calls['strike'].duplicated().any():
+        # Remove duplicate strikes (rare, so only pay for the drop when needed)
+        if not calls['strike'].is_unique:
+            calls = calls.drop_duplicates(subset=['strike'])
             st.warning(f"Duplicate strikes found in calls data for {ticker}.")
-        if puts['strike'].duplicated().any():
+        if not puts['strike'].is_unique:
+            puts = puts.drop_duplicates(subset=['strike'])
             st.warning(f"Duplicate strikes found in puts data for {ticker}.")
         
         # Add ticker and expiration for reference
-        calls['Ticker'] = ticker
-        puts['Ticker'] = ticker
-        calls['Expiration'] = selected_date
-        puts['Expiration'] = selected_date
+        calls = calls.assign(Ticker=ticker, Expiration=selected_date)
+        puts = puts.assign(Ticker=ticker, Expiration=selected_date)
         
         return {
             'calls': calls,
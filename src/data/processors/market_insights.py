@@ -20,29 +20,31 @@ def generate_market_insights(df: pd.DataFrame, periods: list[str], momentum_thre
     """
     insights = []
     
-    # Top and bottom sectors for short-term and long-term
-    short_top = df.sort_values('Short-term Order Flow Score', ascending=False).iloc[0]
-    short_bottom = df.sort_values('Short-term Order Flow Score', ascending=False).iloc[-1]
-    long_top = df.sort_values('Long-term Order Flow Score', ascending=False).iloc[0]
-    long_bottom = df.sort_values('Long-term Order Flow Score', ascending=False).iloc[-1]
+    short = df['Short-term Order Flow Score']
+    long = df['Long-term Order Flow Score']
+    
+    # Top sectors for short-term and long-term
+    short_top = df.iloc[short.argmax()]
+    long_top = df.iloc[long.argmax()]
     
     # Rotation insight
     if short_top['Sector'] != long_top['Sector']:
         insights.append(f"Market is shifting out of **{long_top['Sector']}** (long: {long_top['Long-term Order Flow Score']:.2f}) to **{short_top['Sector']}** (short: {short_top['Short-term Order Flow Score']:.2f}) in the short term.")
     
-    # Momentum insights
-    for _, row in df.iterrows():
-        sector = row['Sector']
-        short_score = row['Short-term Order Flow Score']
-        long_score = row['Long-term Order Flow Score']
-        if short_score > long_score + momentum_threshold:
-            insights.append(f"**{sector}** is experiencing accelerating momentum (short: {short_score:.2f} > long: {long_score:.2f}).")
-        elif short_score < long_score - momentum_threshold:
-            insights.append(f"**{sector}** is experiencing reduced momentum (short: {short_score:.2f} < long: {long_score:.2f}).")
+    # Momentum insights, in row order
+    short_scores, long_scores = short.to_numpy(), long.to_numpy()
+    accelerating = short_scores > long_scores + momentum_threshold
+    decelerating = short_scores < long_scores - momentum_threshold
+    insights += [
+        f"**{sector}** is experiencing accelerating momentum (short: {short_score:.2f} > long: {long_score:.2f})." if up else
+        f"**{sector}** is experiencing reduced momentum (short: {short_score:.2f} < long: {long_score:.2f})."
+        for sector, short_score, long_score, up, down in zip(df['Sector'], short_scores, long_scores, accelerating, decelerating)
+        if up or down
+    ]
     
     # Overall market bias
-    avg_short = df['Short-term Order Flow Score'].mean()
-    avg_long = df['Long-term Order Flow Score'].mean()
+    avg_short = short.mean()
+    avg_long = long.mean()
     if avg_short > bias_threshold and avg_long > bias_threshold:
         insights.append(f"Overall market shows **strong bullish flow** in both short and long term (short avg: {avg_short:.2f}, long avg: {avg_long:.2f}).")
     elif avg_short < -bias_threshold and avg_long < -bias_threshold:
@@ -1,10 +1,10 @@
 # src/data/processors/options.py
 import pandas as pd
 import numpy as np
-from scipy.stats import norm
-from datetime import datetime
+from scipy.special import ndtr  # Standard normal CDF
 import streamlit as st
 
+@st.cache_data(ttl=300)  # Cache for 5 minutes; shared by the chain table and the overall sentiment
 def process_option_chain(option_data: dict, call_put: str, current_price: float) -> pd.DataFrame:
     """
     Process option chain data, adding ITM status and delta.
@@ -32,33 +32,22 @@ def process_option_chain(option_data: dict, call_put: str, current_price: float)
     df = df.drop_duplicates(subset=['Strike'])
     
     # Add ITM status
-    df['ITM'] = df.apply(
-        lambda row: row['Strike'] < current_price if call_put == 'calls' else row['Strike'] > current_price,
-        axis=1
-    )
-    
-    # Simplified delta calculation (Black-Scholes approximation)
-    def calculate_delta(row, is_call: bool):
-        S = current_price  # Underlying price
-        K = row['Strike']  # Strike price
-        sigma = row['Implied Volatility']  # Volatility
-        T = (datetime.strptime(row['Expiration'], '%Y-%m-%d') - datetime.now()).days / 365.0
-        r = 0.05  # Risk-free rate (assumed 5%)
-        
-        if T <= 0 or pd.isna(sigma) or sigma <= 0:
-            return np.nan
-        
-        d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
-        if is_call:
-            delta = norm.cdf(d1)
-        else:
-            delta = norm.cdf(d1) - 1
-        return round(delta, 3)
-    
-    df['Delta'] = df.apply(calculate_delta, axis=1, is_call=call_put == 'calls')
-    
-    # Format numbers (except Implied Volatility, keep numeric for calculations)
-    df[['Last Price', 'Bid', 'Ask']] = df[['Last Price', 'Bid', 'Ask']].apply(lambda x: x.map(lambda y: f"{y:.2f}" if pd.notnull(y) else '-'))
+    strike = df['Strike'].to_numpy(dtype=np.float64)
+    df['ITM'] = strike < current_price if call_put == 'calls' else strike > current_price
+    
+    # Simplified delta calculation (Black-Scholes approximation), vectorized over all strikes
+    S = current_price  # Underlying price
+    sigma = df['Implied Volatility'].to_numpy(dtype=np.float64)  # Volatility
+    T = (pd.to_datetime(df['Expiration'], format='%Y-%m-%d') - pd.Timestamp.now()).dt.days.to_numpy() / 365.0
+    r = 0.05  # Risk-free rate (assumed 5%)
+    valid = (T > 0) & (sigma > 0)  # NaN sigma compares False
+    with np.errstate(divide='ignore', invalid='ignore'):
+        d1 = (np.log(S / strike) + (r + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
+    delta = ndtr(d1) if call_put == 'calls' else ndtr(d1) - 1
+    df['Delta'] = np.round(np.where(valid, delta, np.nan), 3)
+    
+    # Round prices but keep them numeric; renderers format them for display
+    df[['Last Price', 'Bid', 'Ask']] = df[['Last Price', 'Bid', 'Ask']].round(2)
     df[['Volume', 'Open Interest']] = df[['Volume', 'Open Interest']].fillna(0).astype(int)
     
     # Debug: Check for duplicates
@@ -83,17 +72,22 @@ def generate_option_insights(df: pd.DataFrame, call_put: str, current_price: flo
         return "No option data available to analyze."
     
     insights = []
+    strike = df['Strike'].to_numpy(dtype=np.float64)
+    volume = df['Volume'].to_numpy()
+    open_interest = df['Open Interest'].to_numpy()
+    iv = df['Implied Volatility'].to_numpy(dtype=np.float64)
     
     # Detect hot trading (volume > 2 * open interest, min volume 10 for significance)
-    unusual = df[(df['Volume'] > 2 * df['Open Interest']) & (df['Volume'] >= 10)].drop_duplicates(subset=['Strike'])
-    if not unusual.empty:
-        hot_strikes = [f"${row['Strike']:.2f} (Volume: {row['Volume']}, Open Interest: {row['Open Interest']})" for _, row in unusual.iterrows()]
-        insights.append(f"Hot Trading: Traders are betting big at strikes {', '.join(set(hot_strikes))}.")
+    hot = np.flatnonzero((volume > 2 * open_interest) & (volume >= 10))
+    if hot.size:
+        _, first = np.unique(strike[hot], return_index=True)  # One entry per strike
+        hot_strikes = [f"${strike[i]:.2f} (Volume: {volume[i]}, Open Interest: {open_interest[i]})" for i in hot[first]]
+        insights.append(f"Hot Trading: Traders are betting big at strikes {', '.join(hot_strikes)}.")
     
     # Compute IV skew at ATM strike
-    atm_index = (df['Strike'] - current_price).abs().idxmin()
-    atm_strike = df.loc[atm_index, 'Strike']
-    atm_iv = df.loc[atm_index, 'Implied Volatility']
+    atm_pos = np.nanargmin(np.abs(strike - current_price))
+    atm_strike = strike[atm_pos]
+    atm_iv = iv[atm_pos]
     avg_iv = df['Implied Volatility'].mean()
     iv_skew = atm_iv - avg_iv
     if pd.notna(iv_skew):
@@ -102,8 +96,8 @@ def generate_option_insights(df: pd.DataFrame, call_put: str, current_price: flo
         insights.append(f"Price Movement: {skew_type} volatility at strike ${atm_strike:.2f} ({atm_iv*100:.2f}% vs. average {avg_iv*100:.2f}%), {skew_desc}")
     
     # Suggest sentiment
-    total_volume = df['Volume'].sum()
-    itm_volume = df[df['ITM']]['Volume'].sum()
+    total_volume = volume.sum()
+    itm_volume = volume[df['ITM'].to_numpy(dtype=bool)].sum()
     if total_volume > 0 and itm_volume / total_volume > 0.5:
         sentiment = "Upward" if call_put == 'calls' else "Downward"
         sentiment_desc = "traders expect the price to rise." if call_put == 'calls' else "traders expect the price to fall."
@@ -138,9 +132,6 @@ def generate_overall_sentiment(option_data: dict, current_price: float) -> str:
     put_volume = puts['Volume'].sum()
     total_volume = call_volume + put_volume
     
-    # Call/Put Volume Ratio
-    volume_ratio = call_volume / put_volume if put_volume > 0 else float('inf')
-    
     # Hot trading counts (volume > 2 * open interest, min volume 10)
     call_hot = len(calls[(calls['Volume'] > 2 * calls['Open Interest']) & (calls['Volume'] >= 10)])
     put_hot = len(puts[(puts['Volume'] > 2 * puts['Open Interest']) & (puts['Volume'] >= 10)])
@@ -149,10 +140,13 @@ def generate_overall_sentiment(option_data: dict, current_price: float) -> str:
     call_avg_iv = calls['Implied Volatility'].mean() if not calls.empty else 0
     put_avg_iv = puts['Implied Volatility'].mean() if not puts.empty else 0
     
-    # Sentiment score (positive for calls, negative for puts)
-    sentiment_score = (call_volume - put_volume) / total_volume if total_volume > 0 else 0
-    sentiment_score += (call_hot - put_hot) / (call_hot + put_hot + 1)  # Avoid division by zero
-    sentiment_score += (call_avg_iv - put_avg_iv) * 10  # Amplify IV difference
+    # Sentiment score (positive for calls, negative for puts): volume imbalance (0 without volume),
+    # hot strike imbalance (+1 keeps the denominator positive) and amplified IV difference
+    sentiment_score = float(
+        np.divide(call_volume - put_volume, total_volume, out=np.zeros(()), where=total_volume > 0)
+        + (call_hot - put_hot) / (call_hot + put_hot + 1)
+        + (call_avg_iv - put_avg_iv) * 10
+    )
     
     # Determine sentiment
     if sentiment_score > 0.3:
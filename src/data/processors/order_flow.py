@@ -2,11 +2,25 @@
 import pandas as pd
 import numpy as np
 import streamlit as st
+from src.data.cache import disk_cache
 
-@st.cache_data(ttl=3600)  # Cache for 1 hour
-def calculate_order_flow_scores(df: pd.DataFrame, periods: list[str], period_weights: dict, short_term_periods: list[str], long_term_periods: list[str]) -> pd.DataFrame:
+# Approximate trading days per period
+PERIOD_DAYS = {
+    '1d': 1,
+    '5d': 5,
+    '1mo': 20,
+    '3mo': 60,
+    '6mo': 120,
+    '1y': 252
+}
+
+def _order_flow_scores(df: pd.DataFrame, periods: list[str], period_weights: dict, short_term_periods: list[str], long_term_periods: list[str], group_starts: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
     """
-    Calculate Short-term and Long-term Order Flow Scores for each sector based on performance and volume.
+    Calculate Short-term and Long-term Order Flow Scores as two matrix-vector products.
+    
+    Each period's price change is normalized by its largest absolute change and
+    multiplied by volume relative to average volume; the scores weight these
+    (rows x periods) flows with the short- and long-term weight vectors.
     
     Args:
         df: DataFrame with performance and volume data.
@@ -14,35 +28,60 @@ def calculate_order_flow_scores(df: pd.DataFrame, periods: list[str], period_wei
         period_weights: Dict with 'short_term' and 'long_term' weights for each period.
         short_term_periods: List of short-term periods.
         long_term_periods: List of long-term periods.
+        group_starts: Start rows of contiguous groups (e.g., dates) to normalize
+            changes within; None normalizes over all rows.
     
     Returns:
-        DataFrame with Short-term and Long-term Order Flow Scores added.
+        Tuple of (Short-term, Long-term) score arrays aligned with df rows.
     """
-    df = df.copy()
+    change = df[[f'{p} Change (%)' for p in periods]].to_numpy(dtype=np.float64)
+    volume = df[[f'{p} Volume' for p in periods]].to_numpy(dtype=np.float64)
+    avg_volume = df[[f'{p} Avg Volume' for p in periods]].to_numpy(dtype=np.float64)
     
-    # Normalize performance and volume
-    for period in periods:
-        abs_max_change = df[f'{period} Change (%)'].abs().max()
-        df[f'{period} Norm Change'] = df[f'{period} Change (%)'] / abs_max_change if abs_max_change != 0 else 0
-        df[f'{period} Norm Volume'] = df[f'{period} Volume'] / df[f'{period} Avg Volume']
+    # Largest absolute change per period (NaN-skipping), broadcast back to the rows of each group
+    abs_change = np.abs(change)
+    if group_starts is None:
+        abs_max = np.fmax.reduce(abs_change, axis=0)
+    else:
+        group_sizes = np.diff(np.append(group_starts, len(df)))
+        abs_max = np.repeat(np.fmax.reduceat(abs_change, group_starts, axis=0), group_sizes, axis=0)
     
-    # Calculate Short-term and Long-term Order Flow Scores
-    df['Short-term Order Flow Score'] = 0.0
-    df['Long-term Order Flow Score'] = 0.0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        norm_change = np.where(abs_max != 0, change / abs_max, 0.0)
+        norm_volume = np.where(avg_volume > 0, volume / avg_volume, 0.0)
+    flow = np.nan_to_num(norm_change * norm_volume, nan=0.0)
     
-    for period in short_term_periods:
-        if period in periods:
-            weight = period_weights['short_term'].get(period, 1.0 / len(short_term_periods))
-            df['Short-term Order Flow Score'] += weight * (df[f'{period} Norm Change'] * df[f'{period} Norm Volume']).fillna(0)
+    short_weights = np.array([
+        period_weights['short_term'].get(p, 1.0 / len(short_term_periods)) if p in short_term_periods else 0.0
+        for p in periods
+    ])
+    long_weights = np.array([
+        period_weights['long_term'].get(p, 1.0 / len(long_term_periods)) if p in long_term_periods else 0.0
+        for p in periods
+    ])
+    return flow @ short_weights, flow @ long_weights
+
+@st.cache_data(ttl=3600)  # Cache for 1 hour
+def calculate_order_flow_scores(df: pd.DataFrame, periods: list[str], period_weights: dict, short_term_periods: list[str], long_term_periods: list[str]) -> pd.DataFrame:
+    """
+    Calculate Short-term and Long-term Order Flow Scores for each sector based on performance and volume.
     
-    for period in long_term_periods:
-        if period in periods:
-            weight = period_weights['long_term'].get(period, 1.0 / len(long_term_periods))
-            df['Long-term Order Flow Score'] += weight * (df[f'{period} Norm Change'] * df[f'{period} Norm Volume']).fillna(0)
+    Args:
+        df: DataFrame with performance and volume data.
+        periods: List of periods (e.g., ['1d', '1mo']).
+        period_weights: Dict with 'short_term' and 'long_term' weights for each period.
+        short_term_periods: List of short-term periods.
+        long_term_periods: List of long-term periods.
     
+    Returns:
+        DataFrame with Short-term and Long-term Order Flow Scores added.
+    """
+    short_score, long_score = _order_flow_scores(df, periods, period_weights, short_term_periods, long_term_periods)
+    df = df.assign(**{'Short-term Order Flow Score': short_score, 'Long-term Order Flow Score': long_score})
     return df.sort_values('Long-term Order Flow Score', ascending=False)
 
 @st.cache_data(ttl=3600)  # Cache for 1 hour
+@disk_cache(ttl=86400, max_entries=16)  # Keyed on hist_data contents, so safe to keep for a day
 def calculate_historical_order_flow_scores(hist_data: pd.DataFrame, sector_etfs: dict, periods: list[str], period_weights: dict, short_term_periods: list[str], long_term_periods: list[str], start_date: str, end_date: str) -> pd.DataFrame:
     """
     Calculate historical Short-term and Long-term Order Flow Scores for each trading day.
@@ -60,51 +99,56 @@ def calculate_historical_order_flow_scores(hist_data: pd.DataFrame, sector_etfs:
     Returns:
         DataFrame with [Date, Ticker, Sector, Short-term Order Flow Score, Long-term Order Flow Score].
     """
-    period_days = {
-        '1d': 1,
-        '5d': 5,
-        '1mo': 20,  # Approx 20 trading days
-        '3mo': 60,
-        '6mo': 120,
-        '1y': 252
-    }
+    if hist_data.empty:
+        return pd.DataFrame()
     
     start_date = pd.to_datetime(start_date).tz_localize(None)
     end_date = pd.to_datetime(end_date).tz_localize(None)
-    dates = pd.date_range(start=start_date, end=end_date, freq='B')  # Business days
-    dates = [d.tz_localize(None) for d in dates]  # Ensure tz-naive
+    dates = pd.bdate_range(start=start_date, end=end_date).to_numpy()  # Business days as a plain datetime64 array
     
-    results = []
-    for date in dates:
-        df_date = []
-        for ticker, sector in sector_etfs.items():
-            row = {'Date': date, 'Ticker': ticker, 'Sector': sector}
-            ticker_data = hist_data[hist_data['Ticker'] == ticker].set_index('Date')
-            ticker_data = ticker_data.loc[:date].tail(period_days['1y'] + 1)  # Up to 1y prior
-            
-            if len(ticker_data) < 2:
-                continue
-            
-            for period in periods:
-                days = period_days.get(period, 1)
-                period_data = ticker_data.tail(days + 1)
-                if len(period_data) > 1:
-                    price_change = ((period_data['Close'].iloc[-1] - period_data['Close'].iloc[0]) / period_data['Close'].iloc[0]) * 100
-                    row[f'{period} Change (%)'] = price_change
-                    row[f'{period} Volume'] = period_data['Volume'].sum()
-                    row[f'{period} Avg Volume'] = period_data['Volume'].mean()
-                else:
-                    row[f'{period} Change (%)'] = 0.0
-                    row[f'{period} Volume'] = 0.0
-                    row[f'{period} Avg Volume'] = 0.0
-            df_date.append(row)
+    # Periods look back over each ticker's own trading rows, so every ticker is
+    # evaluated for all business days at once on its own arrays
+    by_ticker = {ticker: group.sort_values('Date') for ticker, group in hist_data.groupby('Ticker', sort=False)}
+    frames = []
+    for ticker, sector in sector_etfs.items():
+        ticker_data = by_ticker.get(ticker)
+        if ticker_data is None:
+            continue
+        trade_dates = ticker_data['Date'].to_numpy(dtype=dates.dtype)  # Same unit as the business days searched against it
+        close = ticker_data['Close'].to_numpy(dtype=np.float64)
+        cum_volume = np.concatenate(([0.0], np.cumsum(ticker_data['Volume'].to_numpy(dtype=np.float64))))
+        
+        # Last trading row on or before each business day; need at least two rows of history
+        last = np.searchsorted(trade_dates, dates, side='right') - 1
+        has_history = last >= 1
+        if not has_history.any():
+            continue
+        last = last[has_history]
         
-        if df_date:
-            df = pd.DataFrame(df_date)
-            df = calculate_order_flow_scores(df, periods, period_weights, short_term_periods, long_term_periods)
-            df['Date'] = date
-            results.append(df[['Date', 'Ticker', 'Sector', 'Short-term Order Flow Score', 'Long-term Order Flow Score']])
+        frame = {'Date': dates[has_history], 'Ticker': ticker, 'Sector': sector}
+        for period in periods:
+            first = np.maximum(last - PERIOD_DAYS.get(period, 1), 0)
+            vol_sum = cum_volume[last + 1] - cum_volume[first]
+            frame[f'{period} Change (%)'] = (close[last] - close[first]) / close[first] * 100
+            frame[f'{period} Volume'] = vol_sum
+            frame[f'{period} Avg Volume'] = vol_sum / (last - first + 1)
+        frames.append(pd.DataFrame(frame))
+    
+    if not frames:
+        return pd.DataFrame()
+    
+    df = pd.concat(frames, ignore_index=True).sort_values('Date', kind='stable', ignore_index=True)
+    dates = df['Date'].to_numpy()
+    date_starts = np.flatnonzero(np.r_[True, dates[1:] != dates[:-1]])
+    short_score, long_score = _order_flow_scores(
+        df, periods, period_weights, short_term_periods, long_term_periods, group_starts=date_starts
+    )
     
-    if results:
-        return pd.concat(results, ignore_index=True).dropna()
-    return pd.DataFrame()
\ No newline at end of file
+    # Order by date, then long-term score descending; only the output columns are gathered
+    order = np.lexsort((-long_score, dates))
+    result = df[['Date', 'Ticker', 'Sector']].take(order).reset_index(drop=True)
+    # Categorical sectors make the per-rerun sector filter a compare on integer codes
+    result['Sector'] = pd.Categorical(result['Sector'], categories=sorted(set(sector_etfs.values())))
+    result['Short-term Order Flow Score'] = short_score[order]
+    result['Long-term Order Flow Score'] = long_score[order]
+    return result.dropna()
@@ -1,15 +1,11 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, Optional
 
-@dataclass
+@dataclass(slots=True)
 class ETF:
     """Data model for an ETF with performance metrics."""
     ticker: str
     sector: str
     price: Optional[float] = None
     volume: Optional[float] = None
-    performance: Dict[str, Optional[float]] = None
-
-    def __post_init__(self):
-        if self.performance is None:
-            self.performance = {}
\ No newline at end of file
+    performance: Dict[str, Optional[float]] = field(default_factory=dict)
@@ -1,9 +1,8 @@
 # src/ui/pages/options.py
 import streamlit as st
-from src.data.fetchers.options import fetch_option_chain
+from src.data.fetchers.options import fetch_option_chain, fetch_current_price
 from src.data.processors.options import process_option_chain, generate_option_insights, generate_overall_sentiment
 from src.ui.renderers.options import render_option_chain_table
-import yfinance as yf
 
 def render_options_page():
     """
@@ -41,12 +40,12 @@ def render_options_page():
     call_put = st.sidebar.radio("Select Option Type", ['Calls', 'Puts'], index=0).lower()
     
     # Fetch current price for ITM calculation and insights
-    yf_ticker = yf.Ticker(selected_ticker)
-    current_price = yf_ticker.history(period='1d')['Close'].iloc[-1] if not yf_ticker.history(period='1d').empty else 0.0
+    current_price = fetch_current_price(selected_ticker)
     
     # Process and render option chain
     with st.spinner("Fetching option chain data..."):
-        option_data = fetch_option_chain(selected_ticker, selected_expiration)
+        if selected_expiration != expiration_dates[0]:  # The first load already holds the nearest expiration
+            option_data = fetch_option_chain(selected_ticker, selected_expiration)
         processed_data = process_option_chain(option_data, call_put, current_price)
         st.subheader(f"{call_put.capitalize()} Option Chain for {selected_ticker} ({etfs[selected_ticker]})")
         render_option_chain_table(processed_data, call_put)
@@ -60,6 +59,5 @@ def render_options_page():
         
         # Generate overall sentiment
         st.subheader("Overall Market Sentiment")
-        full_option_data = fetch_option_chain(selected_ticker, selected_expiration)
-        sentiment = generate_overall_sentiment(full_option_data, current_price)
+        sentiment = generate_overall_sentiment(option_data, current_price)
         st.markdown(sentiment)
\ No newline at end of file
@@ -1,6 +1,6 @@
 import streamlit as st
 import pandas as pd
-import yaml
+import numpy as np
 from datetime import datetime, timedelta
 from src.ui.renderers.tables import render_order_flow_table
 from src.ui.renderers.charts import render_order_flow_chart, render_order_flow_comparison_chart, render_net_order_flow_chart
@@ -8,8 +8,37 @@ from src.ui.renderers.details import render_etf_details, render_market_technical
 from src.data.fetchers.etf_data import fetch_sector_performance, fetch_historical_sector_data
 from src.data.processors.order_flow import calculate_order_flow_scores, calculate_historical_order_flow_scores
 from src.data.processors.market_insights import generate_market_insights
-from src.data.fetchers.financials import fetch_sector_financials, fetch_market_historical_financials, fetch_market_financials
-from src.ui.utils.formatting import safe_format
+from src.data.fetchers.financials import fetch_sector_financials, fetch_market_historical_financials, fetch_market_financials, FINANCIAL_METRICS
+
+# Display labels in FINANCIAL_METRICS order
+METRIC_LABELS = ('Trailing P/E', 'Forward P/E', 'PEG Ratio', 'Price/Sales (ttm)', 'Price/Book')
+
+def _metrics_table(fin: pd.DataFrame) -> pd.DataFrame:
+    """
+    Build the Metric/Value display table from a single-row financials DataFrame.
+    
+    Args:
+        fin: Single-row DataFrame with FINANCIAL_METRICS columns.
+    
+    Returns:
+        DataFrame with [Metric, Value], values formatted to two decimals.
+    """
+    return pd.DataFrame({'Metric': METRIC_LABELS, 'Value': _fmt_col(fin[FINANCIAL_METRICS].iloc[0].to_numpy())})
+
+def _fmt_col(values: np.ndarray) -> np.ndarray:
+    """
+    Format a column of numbers to two decimals in one vectorized pass.
+    
+    Args:
+        values: Array of numbers, possibly with NaN/None.
+    
+    Returns:
+        Object array of strings, '-' where the value is missing.
+    """
+    out = np.full(values.shape, '-', dtype=object)
+    valid = pd.notna(values)
+    out[valid] = np.char.mod('%.2f', values[valid].astype(np.float64))
+    return out
 
 def render_sector_rotation_page(sector_data: pd.DataFrame, etfs: dict, periods: list[str], period_weights: dict, short_term_periods: list[str], long_term_periods: list[str], thresholds: dict, sector_stocks: dict) -> None:
     """
@@ -29,19 +58,11 @@ def render_sector_rotation_page(sector_data: pd.DataFrame, etfs: dict, periods:
     
     # Sidebar options
     st.sidebar.header("Terminal Options")
-    sort_score = st.sidebar.selectbox("Sort Order Flow Table by", ['Long-term Order Flow Score', 'Short-term Order Flow Score'], index=0)
-    selected_sector_indicators = st.sidebar.selectbox("Select Sector for Technical Indicators", sorted(list(set(etfs.values())) + ['Whole market']))
-    selected_sector_comparison = st.sidebar.selectbox("Select Sector for Order Flow Comparison", sorted(list(set(etfs.values()))))
-    selected_sector_financials = st.sidebar.selectbox("Select Sector for Financials", sorted(list(set(etfs.values())) + ['Whole market and historic']))
-    
-    # Map selected sector to ticker for ETF details
-    ticker_for_indicators = None
-    if selected_sector_indicators != 'Whole market':
-        ticker_for_indicators = next(ticker for ticker, sector in etfs.items() if sector == selected_sector_indicators)
+    sector_to_ticker = {sector: ticker for ticker, sector in etfs.items()}
+    sectors = sorted(sector_to_ticker)
     
     # Calculate order flow scores
     order_flow_data = calculate_order_flow_scores(sector_data, periods, period_weights, short_term_periods, long_term_periods)
-    order_flow_data = order_flow_data.sort_values(sort_score, ascending=False)
     
     # Fetch historical data for 1-year chart
     end_date = datetime.now()
@@ -52,68 +73,112 @@ def render_sector_rotation_page(sector_data: pd.DataFrame, etfs: dict, periods:
         (end_date - timedelta(days=365)).strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')
     )
     
-    # Render order flow section
-    st.subheader("Sector Order Flow Analysis")
-    render_order_flow_table(order_flow_data, periods)
-    render_order_flow_chart(order_flow_data, sort_score, periods)
-    
-    # Render order flow comparison chart for selected sector
-    st.subheader(f"1-Year Order Flow Comparison for {selected_sector_comparison}")
-    render_order_flow_comparison_chart(hist_scores, selected_sector_comparison)
+    # Each section owns its selector, so changing one reruns only that fragment
+    _order_flow_section(order_flow_data, periods)
+    _comparison_section(hist_scores, sectors)
     
     # Render net order flow chart for all sectors
     st.subheader("1-Year Net Order Flow Across All Sectors")
     render_net_order_flow_chart(hist_scores)
     
-    # Render technical indicators
-    if selected_sector_indicators == 'Whole market':
+    _indicators_section(etfs, sector_to_ticker, sectors, sector_stocks)
+    _financials_section(sectors, sector_stocks)
+    
+    # Auto-refresh
+    if st.sidebar.checkbox("Auto-refresh (every 5 minutes)", value=False):
+        st.session_state['auto_refresh_armed'] = False  # Full runs disarm; only the timer's fragment runs find it armed
+        _auto_refresh()
+
+@st.fragment(run_every=300)
+def _auto_refresh() -> None:
+    """
+    Rerun the whole page every 5 minutes.
+    
+    The timer lives in the browser, so no script thread sleeps between refreshes.
+    The first run of the fragment happens inside a full page run and only arms it.
+    """
+    if st.session_state.get('auto_refresh_armed'):
+        st.rerun(scope='app')
+    st.session_state['auto_refresh_armed'] = True
+
+@st.fragment
+def _order_flow_section(order_flow_data: pd.DataFrame, periods: list[str]) -> None:
+    """
+    Render the order flow table and bar chart with their sort selector.
+    
+    Args:
+        order_flow_data: DataFrame with order flow scores, sorted by the long-term score.
+        periods: List of periods (e.g., ['1d', '1mo']).
+    """
+    st.subheader("Sector Order Flow Analysis")
+    sort_score = st.selectbox("Sort Order Flow Table by", ['Long-term Order Flow Score', 'Short-term Order Flow Score'], index=0)
+    if sort_score != 'Long-term Order Flow Score':  # Scores come back sorted by the long-term score
+        order_flow_data = order_flow_data.sort_values(sort_score, ascending=False)
+    render_order_flow_table(order_flow_data, periods)
+    render_order_flow_chart(order_flow_data, sort_score, periods)
+
+@st.fragment
+def _comparison_section(hist_scores: pd.DataFrame, sectors: list[str]) -> None:
+    """
+    Render the 1-year order flow comparison chart for a selected sector.
+    
+    Args:
+        hist_scores: DataFrame with historical order flow scores.
+        sectors: Sorted sector names.
+    """
+    selected_sector = st.selectbox("Select Sector for Order Flow Comparison", sectors)
+    st.subheader(f"1-Year Order Flow Comparison for {selected_sector}")
+    render_order_flow_comparison_chart(hist_scores, selected_sector)
+
+@st.fragment
+def _indicators_section(etfs: dict, sector_to_ticker: dict, sectors: list[str], sector_stocks: dict) -> None:
+    """
+    Render technical indicators for a selected sector ETF or the whole market.
+    
+    Args:
+        etfs: Dict mapping ETF tickers to sector names.
+        sector_to_ticker: Dict mapping sector names to ETF tickers.
+        sectors: Sorted sector names.
+        sector_stocks: Dict mapping sector names to lists of stock tickers.
+    """
+    selected_sector = st.selectbox("Select Sector for Technical Indicators", sorted(sectors + ['Whole market']))
+    if selected_sector == 'Whole market':
         render_market_technical_indicators(etfs, sector_stocks)
     else:
-        render_etf_details(ticker_for_indicators, selected_sector_indicators, sector_stocks)
+        render_etf_details(sector_to_ticker[selected_sector], selected_sector, sector_stocks)
+
+@st.fragment
+def _financials_section(sectors: list[str], sector_stocks: dict) -> None:
+    """
+    Render aggregated financials for a selected sector or the whole market.
     
-    # Render aggregated financials based on selection
-    st.subheader(f"{selected_sector_financials} financials")
+    Args:
+        sectors: Sorted sector names.
+        sector_stocks: Dict mapping sector names to lists of stock tickers.
+    """
+    selected_sector = st.selectbox("Select Sector for Financials", sorted(sectors + ['Whole market and historic']))
+    st.subheader(f"{selected_sector} financials")
     with st.spinner("Fetching financial data..."):
-        if selected_sector_financials == 'Whole market and historic':
+        if selected_sector == 'Whole market and historic':
             hist_df = fetch_market_historical_financials(sector_stocks)
             if not hist_df.empty:
-                formatted_df = hist_df.apply(lambda x: safe_format(x, '{:.2f}') if pd.notnull(x) else '-')
+                formatted_df = hist_df.apply(lambda col: _fmt_col(col.to_numpy()))
                 st.dataframe(formatted_df.style.set_properties(**{'text-align': 'left'}), width=800)
             else:
                 st.warning("No historical financial data available.")
         else:
-            avg_fin = fetch_sector_financials(selected_sector_financials, sector_stocks)
+            avg_fin = fetch_sector_financials(selected_sector, sector_stocks)
             if not avg_fin.empty:
-                financials = pd.DataFrame([
-                    {'Metric': 'Trailing P/E', 'Value': avg_fin['trailing_pe'].iloc[0]},
-                    {'Metric': 'Forward P/E', 'Value': avg_fin['forward_pe'].iloc[0]},
-                    {'Metric': 'PEG Ratio', 'Value': avg_fin['peg_ratio'].iloc[0]},
-                    {'Metric': 'Price/Sales (ttm)', 'Value': avg_fin['price_sales'].iloc[0]},
-                    {'Metric': 'Price/Book', 'Value': avg_fin['price_book'].iloc[0]},
-                ])
-                financials['Value'] = financials['Value'].apply(lambda x: safe_format(x, '{:.2f}') if pd.notnull(x) else '-')
-                st.dataframe(financials[['Metric', 'Value']].style.set_properties(**{'text-align': 'left'}), width=800)
+                financials = _metrics_table(avg_fin)
+                st.dataframe(financials.style.set_properties(**{'text-align': 'left'}), width=800)
             else:
-                st.warning(f"No financial data available for sector: {selected_sector_financials}")
+                st.warning(f"No financial data available for sector: {selected_sector}")
         
             # Aggregate all sectors table
             st.subheader("All Sectors Aggregate Financials")
             market_fin = fetch_market_financials(sector_stocks)
             if not market_fin.empty:
-                market_financials = pd.DataFrame([
-                    {'Metric': 'Trailing P/E', 'Value': market_fin['trailing_pe'].iloc[0]},
-                    {'Metric': 'Forward P/E', 'Value': market_fin['forward_pe'].iloc[0]},
-                    {'Metric': 'PEG Ratio', 'Value': market_fin['peg_ratio'].iloc[0]},
-                    {'Metric': 'Price/Sales (ttm)', 'Value': market_fin['price_sales'].iloc[0]},
-                    {'Metric': 'Price/Book', 'Value': market_fin['price_book'].iloc[0]},
-                ])
-                market_financials['Value'] = market_financials['Value'].apply(lambda x: safe_format(x, '{:.2f}') if pd.notnull(x) else '-')
-                st.dataframe(market_financials[['Metric', 'Value']].style.set_properties(**{'text-align': 'left'}), width=800)
+                market_financials = _metrics_table(market_fin)
+                st.dataframe(market_financials.style.set_properties(**{'text-align': 'left'}), width=800)
             else:
                 st.warning("No aggregate financial data available.")
-    
-    # Auto-refresh
-    if st.sidebar.checkbox("Auto-refresh (every 5 minutes)", value=False):
-        import time
-        time.sleep(300)
-        st.rerun()
\ No newline at end of file
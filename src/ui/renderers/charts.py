@@ -1,6 +1,64 @@
+import functools
 import streamlit as st
-import plotly.express as px
+import plotly.graph_objects as go
 import pandas as pd
+import numpy as np
+
+SCORE_COLUMNS = ['Short-term Order Flow Score', 'Long-term Order Flow Score']
+SCORE_COLORS = {'Short-term Order Flow Score': '#00CC96', 'Long-term Order Flow Score': '#EF553B'}
+
+def _weekly_mean(scores: pd.DataFrame) -> pd.DataFrame:
+    """
+    Resample daily order flow scores to weekly means.
+    
+    Args:
+        scores: DataFrame with Date and score columns.
+    
+    Returns:
+        DataFrame with one row per week (dated by week end) and the averaged score columns.
+    """
+    return scores.set_index('Date')[SCORE_COLUMNS].resample('W').mean().dropna(how='all').reset_index()
+
+def _score_lines(scores: pd.DataFrame, title: str, yaxis_title: str) -> go.Figure:
+    """
+    Build a line chart with one trace per score column.
+    
+    Args:
+        scores: DataFrame with Date and score columns.
+        title: Chart title.
+        yaxis_title: Y-axis title, also used as the hover label.
+    
+    Returns:
+        Plotly figure.
+    """
+    dates = scores['Date'].to_numpy()
+    fig = go.Figure([
+        go.Scattergl(  # WebGL canvas instead of one SVG node per point
+            x=dates,
+            y=scores[col].to_numpy(),
+            name=col,
+            mode='lines+markers',
+            marker=dict(size=4),
+            line=dict(color=SCORE_COLORS[col]),
+            hovertemplate=f"Date: %{{x}}<br>{yaxis_title}: %{{y}}<extra>{col}</extra>"
+        )
+        for col in SCORE_COLUMNS
+    ])
+    fig.update_layout(
+        title=title,
+        yaxis_title=yaxis_title,
+        xaxis_title="Date",
+        legend_title_text="Score Type",
+        showlegend=True,
+        height=400,
+        uirevision=title  # Keep zoom/pan across reruns of the same chart
+    )
+    return fig
+
+@functools.lru_cache(maxsize=32)
+def _flow_hover_cols(periods: tuple[str, ...]) -> tuple[str, ...]:
+    """Hover columns for the order flow bar chart, built once per periods tuple."""
+    return ('Ticker',) + tuple(f'{p} Change (%)' for p in periods) + tuple(f'{p} Volume' for p in periods)
 
 def render_order_flow_chart(df: pd.DataFrame, sort_score: str, periods: list[str]) -> None:
     """
@@ -11,14 +69,24 @@ def render_order_flow_chart(df: pd.DataFrame, sort_score: str, periods: list[str
         sort_score: Score to display ('Short-term Order Flow Score' or 'Long-term Order Flow Score').
         periods: List of periods for hover data.
     """
-    fig = px.bar(
-        df,
-        x='Sector',
-        y=sort_score,
+    hover_cols = _flow_hover_cols(tuple(periods))
+    scores = df[sort_score].to_numpy()
+    fig = go.Figure(go.Bar(
+        x=df['Sector'].to_numpy(),
+        y=scores,
+        marker=dict(color=scores, colorscale='RdYlGn', colorbar=dict(title=dict(text=sort_score))),
+        customdata=df[list(hover_cols)].to_numpy(),
+        hovertemplate=(
+            f"Sector: %{{x}}<br>{sort_score}: %{{y}}<br>"
+            + "<br>".join(f"{col}: %{{customdata[{i}]}}" for i, col in enumerate(hover_cols))
+            + "<extra></extra>"
+        )
+    ))
+    fig.update_layout(
         title=f"{sort_score} by Sector",
-        color=sort_score,
-        color_continuous_scale='RdYlGn',
-        hover_data=['Ticker'] + [f'{p} Change (%)' for p in periods] + [f'{p} Volume' for p in periods]
+        xaxis_title="Sector",
+        yaxis_title=sort_score,
+        uirevision="order_flow_bar"
     )
     st.plotly_chart(fig)
 
@@ -35,31 +103,8 @@ def render_order_flow_comparison_chart(hist_data: pd.DataFrame, selected_sector:
         st.warning(f"No historical data available for sector: {selected_sector}")
         return
     
-    # Melt data for Plotly
-    melted_data = pd.melt(
-        sector_data,
-        id_vars=['Date'],
-        value_vars=['Short-term Order Flow Score', 'Long-term Order Flow Score'],
-        var_name='Score Type',
-        value_name='Order Flow Score'
-    )
-    
-    fig = px.line(
-        melted_data,
-        x='Date',
-        y='Order Flow Score',
-        color='Score Type',
-        title=f"1-Year Order Flow Scores for {selected_sector}",
-        color_discrete_map={'Short-term Order Flow Score': '#00CC96', 'Long-term Order Flow Score': '#EF553B'},
-        hover_data=['Order Flow Score']
-    )
-    fig.update_traces(mode='lines+markers', marker=dict(size=4))
-    fig.update_layout(
-        yaxis_title="Order Flow Score",
-        xaxis_title="Date",
-        showlegend=True,
-        height=400
-    )
+    # Plot weekly averages; a year of daily points only slows the chart down
+    fig = _score_lines(_weekly_mean(sector_data), f"1-Year Order Flow Scores for {selected_sector}", "Order Flow Score")
     st.plotly_chart(fig, use_container_width=True)
 
 def render_net_order_flow_chart(hist_data: pd.DataFrame) -> None:
@@ -73,35 +118,13 @@ def render_net_order_flow_chart(hist_data: pd.DataFrame) -> None:
         st.warning("No historical data available for net order flow chart.")
         return
     
-    # Aggregate net scores by date (mean across sectors)
-    net_scores = hist_data.groupby('Date').agg({
-        'Short-term Order Flow Score': 'mean',
-        'Long-term Order Flow Score': 'mean'
-    }).reset_index()
+    # Aggregate net scores by date (mean across sectors) with one bincount per score column
+    codes, dates = pd.factorize(hist_data['Date'], sort=True)
+    counts = np.bincount(codes)
+    net_scores = pd.DataFrame({
+        'Date': dates,
+        **{col: np.bincount(codes, weights=hist_data[col].to_numpy(dtype=np.float64)) / counts for col in SCORE_COLUMNS}
+    })
     
-    # Melt data for Plotly
-    melted_data = pd.melt(
-        net_scores,
-        id_vars=['Date'],
-        value_vars=['Short-term Order Flow Score', 'Long-term Order Flow Score'],
-        var_name='Score Type',
-        value_name='Net Order Flow Score'
-    )
-    
-    fig = px.line(
-        melted_data,
-        x='Date',
-        y='Net Order Flow Score',
-        color='Score Type',
-        title="1-Year Net Order Flow Scores Across All Sectors",
-        color_discrete_map={'Short-term Order Flow Score': '#00CC96', 'Long-term Order Flow Score': '#EF553B'},
-        hover_data=['Net Order Flow Score']
-    )
-    fig.update_traces(mode='lines+markers', marker=dict(size=4))
-    fig.update_layout(
-        yaxis_title="Net Order Flow Score",
-        xaxis_title="Date",
-        showlegend=True,
-        height=400
-    )
-    st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+    fig = _score_lines(_weekly_mean(net_scores), "1-Year Net Order Flow Scores Across All Sectors", "Net Order Flow Score")
+    st.plotly_chart(fig, use_container_width=True)
@@ -1,102 +1,178 @@
 import streamlit as st
-import plotly.express as px
+import plotly.graph_objects as go
 import pandas as pd
 import yfinance as yf
 import numpy as np
+from src.data.fetchers.etf_data import fetch_price_histories
 from src.ui.utils.formatting import safe_format
 
-def render_etf_details(ticker: str, sector: str, sector_stocks: dict) -> None:
+@st.cache_resource  # One Ticker object per symbol for the whole process
+def _ticker(ticker: str) -> yf.Ticker:
+    """Get a shared yfinance Ticker object for a symbol."""
+    return yf.Ticker(ticker)
+
+@st.cache_data(ttl=300)  # Cache for 5 minutes
+def _history(ticker: str, period: str) -> pd.DataFrame:
     """
-    Render details for a selected ETF, including enhanced technical indicators.
+    Fetch daily price history for a ticker.
     
     Args:
-        ticker: ETF ticker symbol.
-        sector: ETF sector name.
-        sector_stocks: Dict of sector to list of stock tickers.
+        ticker: Stock or ETF ticker symbol.
+        period: yfinance period string (e.g., '1y').
+    
+    Returns:
+        DataFrame with Open, High, Low, Close and Volume columns.
     """
-    st.subheader(f"Details for {ticker} ({sector})")
-    yf_ticker = yf.Ticker(ticker)
-    history = yf_ticker.history(period='1y')
-    if not history.empty:
-        fig = px.line(history, x=history.index, y='Close', title=f"{ticker} 1-Year Price History")
-        st.plotly_chart(fig)
+    return _ticker(ticker).history(period=period)
+
+# Weights and neutral bands for the overall sentiment signals, in the order
+# SMA 20/50/200, RSI 14/50, ATR 14/50, ROC 14/50
+SIGNAL_WEIGHTS = np.array([1, 0.5, 0.5, 1, 0.5, 1, 0.5, 1, 0.5])
+SIGNAL_THRESHOLDS = np.array([1, 1, 1, 0, 0, 0, 0, 0, 0])
+
+# Interpretation labels indexed by _interpret: (below -threshold, within, above threshold)
+SMA_LABELS = ("Bearish ({:.2f}% below)", "Neutral/mixed (within ±1% of SMA)", "Bullish ({:.2f}% above)")
+ATR_14_LABELS = ("Low volatility ({:.2f}% of price, ATR < 50-day)", "Neutral volatility ({:.2f}% of price)", "High volatility ({:.2f}% of price, ATR > 50-day)")
+ATR_50_LABELS = ("Low volatility ({:.2f}% of price)", "Neutral volatility ({:.2f}% of price)", "High volatility ({:.2f}% of price)")
+ROC_LABELS = ("Bearish ({:.2f}% change)", "Neutral (no change)", "Bullish ({:.2f}% change)")
+# RSI labels indexed by _interpret_rsi: (< 30, 30-50, 50, 50-70, > 70)
+RSI_14_LABELS = ("Oversold (buy signal, {:.2f} < 30)", "Neutral (momentum weakening)", "Neutral (momentum stable)", "Neutral (momentum strengthening)", "Overbought (sell signal, {:.2f} > 70)")
+RSI_50_LABELS = ("Oversold (buy signal, {:.2f} < 30)", "Neutral (momentum weak)", "Neutral (momentum stable)", "Neutral (momentum strong)", "Overbought (sell signal, {:.2f} > 70)")
+
+def _interpret(labels: tuple[str, str, str], shown: float, score: float, threshold: float = 0) -> str:
+    """Pick the label for score below -threshold, within the band (or missing), or above threshold, and format shown into it."""
+    return labels[int(score > threshold) - int(score < -threshold) + 1].format(shown)
+
+def _interpret_rsi(labels: tuple[str, ...], rsi: float) -> str:
+    """Pick the RSI label from the oversold/overbought bounds and the side of 50; a missing RSI reads as stable."""
+    return labels[int(rsi > 70) + int(rsi > 50) - int(rsi < 50) - int(rsi < 30) + 2].format(rsi)
+
+def _tail_mean(values: np.ndarray, window: int) -> float:
+    """Mean of the last window values, or NaN with fewer rows (the last value of rolling(window).mean())."""
+    return values[-window:].mean() if len(values) >= window else np.nan
+
+def _wilder_rsi(close: np.ndarray, period: int) -> float:
+    """
+    Relative Strength Index with Wilder's smoothing, evaluated at the last price.
     
-    # Calculate technical indicators
-    st.subheader("Technical Indicators")
-    if history.empty:
-        st.warning(f"No historical data available for {ticker}")
-        return
+    The first average gain/loss is a simple mean over the first period changes; each
+    later change updates it as avg = (avg * (period - 1) + x) / period. That recursion
+    is applied in closed form, as one weighted sum per series.
     
-    # Ensure history is sorted by date
-    history = history.sort_index()
+    Args:
+        close: Closing prices, oldest first.
+        period: Smoothing period (e.g., 14).
     
-    current_price = history['Close'].iloc[-1]
+    Returns:
+        RSI between 0 and 100, or NaN with fewer than period + 1 prices or no price movement.
+    """
+    delta = np.diff(close)
+    n = len(delta)
+    if n < period:
+        return np.nan
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+    decay = (period - 1) / period
+    # Weight of each later change in the final average, newest last
+    weights = decay ** np.arange(n - period - 1, -1, -1) / period
+    avg_gain = gain[:period].mean() * decay ** (n - period) + weights @ gain[period:]
+    avg_loss = loss[:period].mean() * decay ** (n - period) + weights @ loss[period:]
+    if avg_loss == 0:
+        return 100.0 if avg_gain > 0 else np.nan
+    return 100 - 100 / (1 + avg_gain / avg_loss)
+
+def _compute_indicators(history: pd.DataFrame) -> dict:
+    """
+    Compute SMA, RSI, ATR and ROC indicators from a daily price history.
+    
+    Args:
+        history: Non-empty DataFrame with High, Low and Close columns.
+    
+    Returns:
+        Dict with sma_20_pct, sma_50_pct, sma_200_pct, rsi_14, rsi_50, atr_14_pct, atr_50_pct, roc_14 and roc_50.
+    """
+    # Pull the three price columns out once, in date order; every indicator below
+    # is a slice or reduction over these arrays
+    prices = history[['Close', 'High', 'Low']]
+    if not prices.index.is_monotonic_increasing:
+        prices = prices.sort_index()
+    close, high, low = prices.to_numpy(dtype=np.float64).T
+    current_price = close[-1]
     
     # SMA (20-day, 50-day, 200-day)
-    sma_20 = history['Close'].rolling(window=20).mean().iloc[-1]
+    sma_20 = _tail_mean(close, 20)
     sma_20_pct = ((current_price - sma_20) / sma_20 * 100) if pd.notnull(sma_20) else np.nan
-    sma_20_interpret = f"Bullish ({sma_20_pct:.2f}% above)" if sma_20_pct > 1 else f"Bearish ({abs(sma_20_pct):.2f}% below)" if sma_20_pct < -1 else "Neutral/mixed (within ±1% of SMA)"
     
-    sma_50 = history['Close'].rolling(window=50).mean().iloc[-1]
+    sma_50 = _tail_mean(close, 50)
     sma_50_pct = ((current_price - sma_50) / sma_50 * 100) if pd.notnull(sma_50) else np.nan
-    sma_50_interpret = f"Bullish ({sma_50_pct:.2f}% above)" if sma_50_pct > 1 else f"Bearish ({abs(sma_50_pct):.2f}% below)" if sma_50_pct < -1 else "Neutral/mixed (within ±1% of SMA)"
     
-    sma_200 = history['Close'].rolling(window=200).mean().iloc[-1] if len(history) >= 200 else np.nan
+    sma_200 = _tail_mean(close, 200)
     sma_200_pct = ((current_price - sma_200) / sma_200 * 100) if pd.notnull(sma_200) else np.nan
-    sma_200_interpret = f"Bullish ({sma_200_pct:.2f}% above)" if sma_200_pct > 1 else f"Bearish ({abs(sma_200_pct):.2f}% below)" if sma_200_pct < -1 else "Neutral/mixed (within ±1% of SMA)"
     
     # RSI (14-day, 50-day)
-    delta = history['Close'].diff()
-    gain = delta.where(delta > 0, 0)
-    loss = -delta.where(delta < 0, 0)
-    
-    avg_gain_14 = gain.rolling(window=14).mean().iloc[-1]
-    avg_loss_14 = loss.rolling(window=14).mean().iloc[-1]
-    rs_14 = avg_gain_14 / avg_loss_14 if avg_loss_14 != 0 else np.nan
-    rsi_14 = 100 - (100 / (1 + rs_14)) if pd.notnull(rs_14) else np.nan
-    
-    avg_gain_50 = gain.rolling(window=50).mean().iloc[-1]
-    avg_loss_50 = loss.rolling(window=50).mean().iloc[-1]
-    rs_50 = avg_gain_50 / avg_loss_50 if avg_loss_50 != 0 else np.nan
-    rsi_50 = 100 - (100 / (1 + rs_50)) if pd.notnull(rs_50) else np.nan
+    rsi_14 = _wilder_rsi(close, 14)
+    rsi_50 = _wilder_rsi(close, 50)
     
     # ATR (14-day, 50-day)
-    true_range = pd.concat([
-        history['High'] - history['Low'],
-        (history['High'] - history['Close'].shift()).abs(),
-        (history['Low'] - history['Close'].shift()).abs()
-    ], axis=1).max(axis=1)
-    atr_50 = true_range.rolling(window=50).mean().iloc[-1]
-    atr_14 = true_range.rolling(window=14).mean().iloc[-1]
+    prev_close = np.concatenate(([np.nan], close[:-1]))
+    # fmax skips the missing previous close on the first row, as the row-wise DataFrame max did
+    true_range_values = np.fmax.reduce([high - low, np.abs(high - prev_close), np.abs(low - prev_close)])
+    atr_50 = _tail_mean(true_range_values, 50)
+    atr_14 = _tail_mean(true_range_values, 14)
     atr_14_pct = (atr_14 / current_price * 100) if pd.notnull(atr_14) and current_price != 0 else np.nan
     atr_50_pct = (atr_50 / current_price * 100) if pd.notnull(atr_50) and current_price != 0 else np.nan
-    atr_200 = true_range.rolling(window=200).mean().iloc[-1] if len(history) >= 200 else np.nan
     
     # ROC
-    roc_14 = ((current_price - history['Close'].shift(14).iloc[-1]) / history['Close'].shift(14).iloc[-1] * 100) if len(history) > 14 else np.nan
-    roc_50 = ((current_price - history['Close'].shift(50).iloc[-1]) / history['Close'].shift(50).iloc[-1] * 100) if len(history) > 50 else np.nan
+    price_14_ago = close[-15] if len(close) > 14 else np.nan
+    price_50_ago = close[-51] if len(close) > 50 else np.nan
+    roc_14 = (current_price - price_14_ago) / price_14_ago * 100
+    roc_50 = (current_price - price_50_ago) / price_50_ago * 100
+    
+    return {
+        'sma_20_pct': sma_20_pct,
+        'sma_50_pct': sma_50_pct,
+        'sma_200_pct': sma_200_pct,
+        'rsi_14': rsi_14,
+        'rsi_50': rsi_50,
+        'atr_14_pct': atr_14_pct,
+        'atr_50_pct': atr_50_pct,
+        'roc_14': roc_14,
+        'roc_50': roc_50
+    }
+
+def _render_indicators_table(values: dict) -> None:
+    """
+    Render the indicators table with interpretations and an overall sentiment row.
+    
+    Args:
+        values: Indicator values keyed as returned by _compute_indicators.
+    """
+    sma_20_pct, sma_50_pct, sma_200_pct = values['sma_20_pct'], values['sma_50_pct'], values['sma_200_pct']
+    rsi_14, rsi_50 = values['rsi_14'], values['rsi_50']
+    atr_14_pct, atr_50_pct = values['atr_14_pct'], values['atr_50_pct']
+    roc_14, roc_50 = values['roc_14'], values['roc_50']
     
     # Interpretations
-    rsi_14_interpret = f"Overbought (sell signal, {rsi_14:.2f} > 70)" if rsi_14 > 70 else f"Oversold (buy signal, {rsi_14:.2f} < 30)" if rsi_14 < 30 else f"Neutral (momentum {'strengthening' if rsi_14 > 50 else 'weakening' if rsi_14 < 50 else 'stable'})"
-    rsi_50_interpret = f"Overbought (sell signal, {rsi_50:.2f} > 70)" if rsi_50 > 70 else f"Oversold (buy signal, {rsi_50:.2f} < 30)" if rsi_50 < 30 else f"Neutral (momentum {'strong' if rsi_50 > 50 else 'weak' if rsi_50 < 50 else 'stable'})"
-    atr_14_interpret = f"High volatility ({atr_14_pct:.2f}% of price, ATR > 50-day)" if atr_14_pct > atr_50_pct else f"Low volatility ({atr_14_pct:.2f}% of price, ATR < 50-day)" if atr_14_pct < atr_50_pct else f"Neutral volatility ({atr_14_pct:.2f}% of price)"
-    atr_50_interpret = f"High volatility ({atr_50_pct:.2f}% of price)" if atr_50_pct > atr_14_pct else f"Low volatility ({atr_50_pct:.2f}% of price)" if atr_50_pct < atr_14_pct else f"Neutral volatility ({atr_50_pct:.2f}% of price)"
-    roc_14_interpret = f"Bullish ({roc_14:.2f}% change)" if roc_14 > 0 else f"Bearish ({abs(roc_14):.2f}% change)" if roc_14 < 0 else "Neutral (no change)"
-    roc_50_interpret = f"Bullish ({roc_50:.2f}% change)" if roc_50 > 0 else f"Bearish ({abs(roc_50):.2f}% change)" if roc_50 < 0 else "Neutral (no change)"
-    
-    # Overall Sentiment
-    signals = [
-        (1, 1 if sma_20_pct > 1 else -1 if sma_20_pct < -1 else 0),  # Short SMA
-        (0.5, 1 if sma_50_pct > 1 else -1 if sma_50_pct < -1 else 0),  # Mid SMA
-        (0.5, 1 if sma_200_pct > 1 else -1 if sma_200_pct < -1 else 0),  # Long SMA
-        (1, 1 if rsi_14 > 70 else -1 if rsi_14 < 30 else 1 if rsi_14 > 50 else -1 if rsi_14 < 50 else 0),  # Short RSI
-        (0.5, 1 if rsi_50 > 70 else -1 if rsi_50 < 30 else 1 if rsi_50 > 50 else -1 if rsi_50 < 50 else 0),  # Long RSI
-        (1, 1 if atr_14_pct > atr_50_pct else -1 if atr_14_pct < atr_50_pct else 0),  # Short ATR
-        (0.5, 1 if atr_50_pct > atr_14_pct else -1 if atr_50_pct < atr_14_pct else 0),  # Long ATR
-        (1, 1 if roc_14 > 0 else -1 if roc_14 < 0 else 0),  # Short ROC
-        (0.5, 1 if roc_50 > 0 else -1 if roc_50 < 0 else 0)  # Long ROC
-    ]
-    sentiment_score = sum(weight * signal for weight, signal in signals)
+    sma_20_interpret = _interpret(SMA_LABELS, abs(sma_20_pct), sma_20_pct, 1)
+    sma_50_interpret = _interpret(SMA_LABELS, abs(sma_50_pct), sma_50_pct, 1)
+    sma_200_interpret = _interpret(SMA_LABELS, abs(sma_200_pct), sma_200_pct, 1)
+    rsi_14_interpret = _interpret_rsi(RSI_14_LABELS, rsi_14)
+    rsi_50_interpret = _interpret_rsi(RSI_50_LABELS, rsi_50)
+    atr_14_interpret = _interpret(ATR_14_LABELS, atr_14_pct, atr_14_pct - atr_50_pct)
+    atr_50_interpret = _interpret(ATR_50_LABELS, atr_50_pct, atr_50_pct - atr_14_pct)
+    roc_14_interpret = _interpret(ROC_LABELS, abs(roc_14), roc_14)
+    roc_50_interpret = _interpret(ROC_LABELS, abs(roc_50), roc_50)
+    
+    # Overall Sentiment: each signal is +1/-1 beyond its threshold and 0 otherwise (or when missing).
+    # RSI votes by side of 50 (overbought/oversold agree with that side), ATR by which average is larger
+    signal_values = np.array([
+        sma_20_pct, sma_50_pct, sma_200_pct,  # Short, mid and long SMA
+        rsi_14 - 50, rsi_50 - 50,  # Short and long RSI
+        atr_14_pct - atr_50_pct, atr_50_pct - atr_14_pct,  # Short and long ATR
+        roc_14, roc_50  # Short and long ROC
+    ], dtype=np.float64)
+    signals = np.where(signal_values > SIGNAL_THRESHOLDS, 1, np.where(signal_values < -SIGNAL_THRESHOLDS, -1, 0))
+    sentiment_score = SIGNAL_WEIGHTS @ signals
     overall_interpret = ("Bullish overall (short-term strength)" if sentiment_score > 1 else
                         "Bearish overall (long-term weakness)" if sentiment_score < -1 else
                         "Mixed/neutral signals")
@@ -117,6 +193,30 @@ def render_etf_details(ticker: str, sector: str, sector_stocks: dict) -> None:
     indicators['Value'] = indicators['Value'].apply(lambda x: safe_format(x, '{:.2f}') if isinstance(x, (int, float)) else x)
     st.dataframe(indicators[['Indicator', 'Value', 'Interpretation']].style.set_properties(**{'text-align': 'left'}), width=800)
 
+def render_etf_details(ticker: str, sector: str, sector_stocks: dict) -> None:
+    """
+    Render details for a selected ETF, including enhanced technical indicators.
+    
+    Args:
+        ticker: ETF ticker symbol.
+        sector: ETF sector name.
+        sector_stocks: Dict of sector to list of stock tickers.
+    """
+    st.subheader(f"Details for {ticker} ({sector})")
+    history = _history(ticker, '1y')
+    if not history.empty:
+        fig = go.Figure(go.Scattergl(x=history.index, y=history['Close'].to_numpy(), mode='lines', name='Close'))  # WebGL canvas rendering
+        fig.update_layout(title=f"{ticker} 1-Year Price History", xaxis_title="Date", yaxis_title="Close", uirevision=ticker)
+        st.plotly_chart(fig)
+    
+    # Calculate technical indicators
+    st.subheader("Technical Indicators")
+    if history.empty:
+        st.warning(f"No historical data available for {ticker}")
+        return
+    
+    _render_indicators_table(_compute_indicators(history))
+
 def render_market_technical_indicators(etfs: dict, sector_stocks: dict) -> None:
     """
     Render technical indicators averaged across all sector ETFs/stocks.
@@ -125,118 +225,18 @@ def render_market_technical_indicators(etfs: dict, sector_stocks: dict) -> None:
         etfs: Dict mapping ETF tickers to sector names.
         sector_stocks: Dict of sector to list of stock tickers.
     """
-    indicators_data = []
-    for ticker, sector in etfs.items():
-        yf_ticker = yf.Ticker(ticker)
-        history = yf_ticker.history(period='1y')
-        if history.empty:
-            continue
-        
-        # Ensure history is sorted by date
-        history = history.sort_index()
-        
-        current_price = history['Close'].iloc[-1]
-        
-        # SMA (20-day, 50-day, 200-day)
-        sma_20 = history['Close'].rolling(window=20).mean().iloc[-1]
-        sma_20_pct = ((current_price - sma_20) / sma_20 * 100) if pd.notnull(sma_20) else np.nan
-        
-        sma_50 = history['Close'].rolling(window=50).mean().iloc[-1]
-        sma_50_pct = ((current_price - sma_50) / sma_50 * 100) if pd.notnull(sma_50) else np.nan
-        
-        sma_200 = history['Close'].rolling(window=200).mean().iloc[-1] if len(history) >= 200 else np.nan
-        sma_200_pct = ((current_price - sma_200) / sma_200 * 100) if pd.notnull(sma_200) else np.nan
-        
-        # RSI (14-day, 50-day)
-        delta = history['Close'].diff()
-        gain = delta.where(delta > 0, 0)
-        loss = -delta.where(delta < 0, 0)
-        
-        avg_gain_14 = gain.rolling(window=14).mean().iloc[-1]
-        avg_loss_14 = loss.rolling(window=14).mean().iloc[-1]
-        rs_14 = avg_gain_14 / avg_loss_14 if avg_loss_14 != 0 else np.nan
-        rsi_14 = 100 - (100 / (1 + rs_14)) if pd.notnull(rs_14) else np.nan
-        
-        avg_gain_50 = gain.rolling(window=50).mean().iloc[-1]
-        avg_loss_50 = loss.rolling(window=50).mean().iloc[-1]
-        rs_50 = avg_gain_50 / avg_loss_50 if avg_loss_50 != 0 else np.nan
-        rsi_50 = 100 - (100 / (1 + rs_50)) if pd.notnull(rs_50) else np.nan
-        
-        # ATR (14-day, 50-day)
-        true_range = pd.concat([
-            history['High'] - history['Low'],
-            (history['High'] - history['Close'].shift()).abs(),
-            (history['Low'] - history['Close'].shift()).abs()
-        ], axis=1).max(axis=1)
-        atr_50 = true_range.rolling(window=50).mean().iloc[-1]
-        atr_14 = true_range.rolling(window=14).mean().iloc[-1]
-        atr_14_pct = (atr_14 / current_price * 100) if pd.notnull(atr_14) and current_price != 0 else np.nan
-        atr_50_pct = (atr_50 / current_price * 100) if pd.notnull(atr_50) and current_price != 0 else np.nan
-        
-        # ROC
-        roc_14 = ((current_price - history['Close'].shift(14).iloc[-1]) / history['Close'].shift(14).iloc[-1] * 100) if len(history) > 14 else np.nan
-        roc_50 = ((current_price - history['Close'].shift(50).iloc[-1]) / history['Close'].shift(50).iloc[-1] * 100) if len(history) > 50 else np.nan
-        
-        indicators_data.append({
-            'Ticker': ticker,
-            'sma_20_pct': sma_20_pct,
-            'sma_50_pct': sma_50_pct,
-            'sma_200_pct': sma_200_pct,
-            'rsi_14': rsi_14,
-            'rsi_50': rsi_50,
-            'atr_14_pct': atr_14_pct,
-            'atr_50_pct': atr_50_pct,
-            'roc_14': roc_14,
-            'roc_50': roc_50
-        })
+    # Fetch all ETF histories in one batched request
+    histories = fetch_price_histories(list(etfs), '1y')
     
+    indicators_data = [_compute_indicators(history) for history in histories.values() if not history.empty]
     if not indicators_data:
         st.warning("No historical data available for market indicators.")
         return
     
-    # Aggregate averages
-    avg_df = pd.DataFrame(indicators_data).mean(numeric_only=True, skipna=True)
-    
-    # Interpretations
-    sma_20_interpret = f"Bullish ({avg_df['sma_20_pct']:.2f}% above)" if avg_df['sma_20_pct'] > 1 else f"Bearish ({abs(avg_df['sma_20_pct']):.2f}% below)" if avg_df['sma_20_pct'] < -1 else "Neutral/mixed (within ±1% of SMA)"
-    sma_50_interpret = f"Bullish ({avg_df['sma_50_pct']:.2f}% above)" if avg_df['sma_50_pct'] > 1 else f"Bearish ({abs(avg_df['sma_50_pct']):.2f}% below)" if avg_df['sma_50_pct'] < -1 else "Neutral/mixed (within ±1% of SMA)"
-    sma_200_interpret = f"Bullish ({avg_df['sma_200_pct']:.2f}% above)" if avg_df['sma_200_pct'] > 1 else f"Bearish ({abs(avg_df['sma_200_pct']):.2f}% below)" if avg_df['sma_200_pct'] < -1 else "Neutral/mixed (within ±1% of SMA)"
-    rsi_14_interpret = f"Overbought (sell signal, {avg_df['rsi_14']:.2f} > 70)" if avg_df['rsi_14'] > 70 else f"Oversold (buy signal, {avg_df['rsi_14']:.2f} < 30)" if avg_df['rsi_14'] < 30 else f"Neutral (momentum {'strengthening' if avg_df['rsi_14'] > 50 else 'weakening' if avg_df['rsi_14'] < 50 else 'stable'})"
-    rsi_50_interpret = f"Overbought (sell signal, {avg_df['rsi_50']:.2f} > 70)" if avg_df['rsi_50'] > 70 else f"Oversold (buy signal, {avg_df['rsi_50']:.2f} < 30)" if avg_df['rsi_50'] < 30 else f"Neutral (momentum {'strong' if avg_df['rsi_50'] > 50 else 'weak' if avg_df['rsi_50'] < 50 else 'stable'})"
-    atr_14_interpret = f"High volatility ({avg_df['atr_14_pct']:.2f}% of price, ATR > 50-day)" if avg_df['atr_14_pct'] > avg_df['atr_50_pct'] else f"Low volatility ({avg_df['atr_14_pct']:.2f}% of price, ATR < 50-day)" if avg_df['atr_14_pct'] < avg_df['atr_50_pct'] else f"Neutral volatility ({avg_df['atr_14_pct']:.2f}% of price)"
-    atr_50_interpret = f"High volatility ({avg_df['atr_50_pct']:.2f}% of price)" if avg_df['atr_50_pct'] > avg_df['atr_14_pct'] else f"Low volatility ({avg_df['atr_50_pct']:.2f}% of price)" if avg_df['atr_50_pct'] < avg_df['atr_14_pct'] else f"Neutral volatility ({avg_df['atr_50_pct']:.2f}% of price)"
-    roc_14_interpret = f"Bullish ({avg_df['roc_14']:.2f}% change)" if avg_df['roc_14'] > 0 else f"Bearish ({abs(avg_df['roc_14']):.2f}% change)" if avg_df['roc_14'] < 0 else "Neutral (no change)"
-    roc_50_interpret = f"Bullish ({avg_df['roc_50']:.2f}% change)" if avg_df['roc_50'] > 0 else f"Bearish ({abs(avg_df['roc_50']):.2f}% change)" if avg_df['roc_50'] < 0 else "Neutral (no change)"
-    
-    # Overall Sentiment
-    signals = [
-        (1, 1 if avg_df['sma_20_pct'] > 1 else -1 if avg_df['sma_20_pct'] < -1 else 0),  # Short SMA
-        (0.5, 1 if avg_df['sma_50_pct'] > 1 else -1 if avg_df['sma_50_pct'] < -1 else 0),  # Mid SMA
-        (0.5, 1 if avg_df['sma_200_pct'] > 1 else -1 if avg_df['sma_200_pct'] < -1 else 0),  # Long SMA
-        (1, 1 if avg_df['rsi_14'] > 70 else -1 if avg_df['rsi_14'] < 30 else 1 if avg_df['rsi_14'] > 50 else -1 if avg_df['rsi_14'] < 50 else 0),  # Short RSI
-        (0.5, 1 if avg_df['rsi_50'] > 70 else -1 if avg_df['rsi_50'] < 30 else 1 if avg_df['rsi_50'] > 50 else -1 if avg_df['rsi_50'] < 50 else 0),  # Long RSI
-        (1, 1 if avg_df['atr_14_pct'] > avg_df['atr_50_pct'] else -1 if avg_df['atr_14_pct'] < avg_df['atr_50_pct'] else 0),  # Short ATR
-        (0.5, 1 if avg_df['atr_50_pct'] > avg_df['atr_14_pct'] else -1 if avg_df['atr_50_pct'] < avg_df['atr_14_pct'] else 0),  # Long ATR
-        (1, 1 if avg_df['roc_14'] > 0 else -1 if avg_df['roc_14'] < 0 else 0),  # Short ROC
-        (0.5, 1 if avg_df['roc_50'] > 0 else -1 if avg_df['roc_50'] < 0 else 0)  # Long ROC
-    ]
-    sentiment_score = sum(weight * signal for weight, signal in signals)
-    overall_interpret = ("Bullish overall (short-term strength)" if sentiment_score > 1 else
-                        "Bearish overall (long-term weakness)" if sentiment_score < -1 else
-                        "Mixed/neutral signals")
+    # Aggregate averages: NaN-skipping mean over one ETF x indicator array;
+    # indicators missing for every ETF stay NaN
+    values = np.array([list(row.values()) for row in indicators_data], dtype=np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = np.nansum(values, axis=0) / np.sum(~np.isnan(values), axis=0)
     
-    # Create indicators table
-    indicators = pd.DataFrame([
-        {'Indicator': '20-day SMA %', 'Value': avg_df['sma_20_pct'], 'Interpretation': sma_20_interpret},
-        {'Indicator': '50-day SMA %', 'Value': avg_df['sma_50_pct'], 'Interpretation': sma_50_interpret},
-        {'Indicator': '200-day SMA %', 'Value': avg_df['sma_200_pct'], 'Interpretation': sma_200_interpret},
-        {'Indicator': '14-day RSI', 'Value': avg_df['rsi_14'], 'Interpretation': rsi_14_interpret},
-        {'Indicator': '50-day RSI', 'Value': avg_df['rsi_50'], 'Interpretation': rsi_50_interpret},
-        {'Indicator': '14-day ATR %', 'Value': avg_df['atr_14_pct'], 'Interpretation': atr_14_interpret},
-        {'Indicator': '50-day ATR %', 'Value': avg_df['atr_50_pct'], 'Interpretation': atr_50_interpret},
-        {'Indicator': '14-day ROC', 'Value': avg_df['roc_14'], 'Interpretation': roc_14_interpret},
-        {'Indicator': '50-day ROC', 'Value': avg_df['roc_50'], 'Interpretation': roc_50_interpret},
-        {'Indicator': 'Overall Sentiment', 'Value': '-', 'Interpretation': overall_interpret}
-    ])
-    indicators['Value'] = indicators['Value'].apply(lambda x: safe_format(x, '{:.2f}') if isinstance(x, (int, float)) else x)
-    st.dataframe(indicators[['Indicator', 'Value', 'Interpretation']].style.set_properties(**{'text-align': 'left'}), width=800)
\ No newline at end of file
+    _render_indicators_table(dict(zip(indicators_data[0], means)))
@@ -1,7 +1,8 @@
 # src/ui/renderers/options.py
 import streamlit as st
-import plotly.express as px
+import plotly.graph_objects as go
 import pandas as pd
+import numpy as np
 
 def render_option_chain_table(df: pd.DataFrame, call_put: str) -> None:
     """
@@ -15,39 +16,42 @@ def render_option_chain_table(df: pd.DataFrame, call_put: str) -> None:
         st.warning(f"No {call_put} data available for the selected ticker and expiration.")
         return
     
-    # Format Implied Volatility for display
-    df_display = df.copy()
-    df_display['Implied Volatility'] = df_display['Implied Volatility'].apply(lambda x: f"{x*100:.2f}%" if pd.notnull(x) else '-')
+    # Format Implied Volatility for display as a standalone array; df itself is only read
+    iv = df['Implied Volatility']
+    iv_display = np.where(iv.notna(), (iv * 100).map('{:.2f}%'.format), '-')
+    itm = df['ITM'].to_numpy(dtype=bool)
     
-    # Create Plotly table
-    fig = px.scatter(df_display, x='Strike', y='Last Price', hover_data=df_display.columns, title=f"{call_put.capitalize()} Option Chain")
-    
-    # Style table (simulating a table with Plotly)
-    fig.update_traces(
-        marker=dict(size=0),  # Hide scatter points
-        text=df_display.apply(lambda row: f"{'<b>ITM</b>' if row['ITM'] else 'OTM'}", axis=1),
+    # Create Plotly table; Scattergl draws on a WebGL canvas, which stays responsive on long chains
+    itm_color = {'calls': 'green', 'puts': 'red'}.get(call_put, 'gray')
+    fig = go.Figure(go.Scattergl(
+        x=df['Strike'].to_numpy(),
+        y=df['Last Price'].to_numpy(),
+        mode='markers',
+        # Style table (simulating a table with Plotly): hide scatter points, color-code ITM (green for calls, red for puts)
+        marker=dict(size=0, color=np.where(itm, itm_color, 'gray')),
+        text=np.where(itm, '<b>ITM</b>', 'OTM'),
         textposition='top center',
         hovertemplate=(
             "<b>%{customdata[0]}</b><br>"  # Ticker
             "Expiration: %{customdata[1]}<br>"  # Expiration
             "Strike: $%{x}<br>"
-            "Last Price: $%{y}<br>"
-            "Bid: $%{customdata[4]}<br>"
-            "Ask: $%{customdata[5]}<br>"
+            "Last Price: $%{y:.2f}<br>"
+            "Bid: $%{customdata[4]:.2f}<br>"
+            "Ask: $%{customdata[5]:.2f}<br>"
             "Volume: %{customdata[6]}<br>"
             "Open Interest: %{customdata[7]}<br>"
             "Implied Volatility: %{customdata[8]}<br>"
             "Delta: %{customdata[9]}<br>"
             "<extra></extra>"
         ),
-        customdata=df_display.values
-    )
-    
-    # Color-code ITM (green for calls, red for puts)
-    df_display['Color'] = df_display['ITM'].apply(lambda x: 'green' if x and call_put == 'calls' else 'red' if x and call_put == 'puts' else 'gray')
-    fig.update_traces(marker=dict(color=df_display['Color']))
+        customdata=np.column_stack([
+            df['Ticker'], df['Expiration'], df['Strike'], df['Last Price'], df['Bid'], df['Ask'],
+            df['Volume'], df['Open Interest'], iv_display, df['Delta']
+        ])
+    ))
     
     fig.update_layout(
+        title=f"{call_put.capitalize()} Option Chain",
         showlegend=False,
         xaxis_title="Strike Price",
         yaxis_title="Last Price",
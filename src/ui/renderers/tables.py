@@ -1,6 +1,11 @@
+import functools
 import streamlit as st
 import pandas as pd
-from src.ui.utils.formatting import safe_format
+
+@functools.lru_cache(maxsize=32)
+def _table_columns(periods: tuple[str, ...]) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """Change and volume column names for the order flow table, built once per periods tuple."""
+    return tuple(f'{p} Change (%)' for p in periods), tuple(f'{p} Volume' for p in periods)
 
 def render_order_flow_table(df: pd.DataFrame, periods: list[str]) -> None:
     """
@@ -10,10 +15,15 @@ def render_order_flow_table(df: pd.DataFrame, periods: list[str]) -> None:
         df: DataFrame with order flow scores.
         periods: List of periods (e.g., ['1d', '1mo']).
     """
-    format_dict = {
-        'Short-term Order Flow Score': lambda x: safe_format(x, '{:.2f}'),
-        'Long-term Order Flow Score': lambda x: safe_format(x, '{:.2f}')
+    change_cols, volume_cols = _table_columns(tuple(periods))
+    # Keep values numeric (so columns sort numerically) and let the table format them;
+    # volumes are scaled to millions in one vectorized step
+    display_df = df[['Ticker', 'Sector', 'Short-term Order Flow Score', 'Long-term Order Flow Score', *change_cols, *volume_cols]]
+    display_df = display_df.assign(**{col: display_df[col] / 1_000_000 for col in volume_cols})
+    column_config = {
+        'Short-term Order Flow Score': st.column_config.NumberColumn(format='%.2f'),
+        'Long-term Order Flow Score': st.column_config.NumberColumn(format='%.2f'),
+        **{col: st.column_config.NumberColumn(format='%.2f%%') for col in change_cols},
+        **{col: st.column_config.NumberColumn(format='%.1fM') for col in volume_cols},
     }
-    format_dict.update({f'{p} Change (%)': lambda x: safe_format(x, '{:.2f}%') for p in periods})
-    format_dict.update({f'{p} Volume': lambda x: safe_format(x, '{:.1f}M') for p in periods})
-    st.dataframe(df[['Ticker', 'Sector', 'Short-term Order Flow Score', 'Long-term Order Flow Score'] + [f'{p} Change (%)' for p in periods] + [f'{p} Volume' for p in periods]].style.format(format_dict), width=1200)
\ No newline at end of file
+    st.dataframe(display_df, column_config=column_config, width=1200)
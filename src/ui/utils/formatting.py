@@ -1,5 +1,13 @@
+import functools
 import pandas as pd
 
+@functools.lru_cache(maxsize=32)
+def _formatter(fmt: str):
+    """Build the formatting callable for a format string once and reuse it."""
+    if fmt.endswith('M'):  # Handle millions format for volumes
+        return lambda value: f"{value / 1_000_000:.1f}M"
+    return fmt.format
+
 def safe_format(value: float, fmt: str) -> str:
     """
     Format a value safely, handling NaN/None.
@@ -11,8 +19,4 @@ def safe_format(value: float, fmt: str) -> str:
     Returns:
         Formatted string or '-' if invalid.
     """
-    if pd.notnull(value):
-        if fmt.endswith('M'):  # Handle millions format for volumes
-            return f"{value / 1_000_000:.1f}M"
-        return fmt.format(value)
-    return "-"
\ No newline at end of file
+    return _formatter(fmt)(value) if pd.notnull(value) else "-"